@@ -1,56 +1,345 @@
 """Base classes and shared utilities for log collectors."""
 
+import json
+import os
+import re
+import signal
 import subprocess
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
 from rich.console import Console
 
 console = Console(stderr=True)
 
+# Collectors run their sub-collections on worker threads; serialize log lines
+# so stderr output from concurrent commands does not interleave.
+_console_lock = threading.Lock()
 
-@dataclass
+_MAX_WORKERS = 8
+
+# run_command(cacheable=True) memo: argv -> (monotonic time, stdout). Only
+# complete, successful runs are stored, so a failure is retried next time.
+_COMMAND_CACHE: dict[tuple[str, ...], tuple[float, str]] = {}
+_COMMAND_CACHE_TTL = 30.0
+
+_LEVEL_RE = re.compile(r"\b(emerg|alert|crit|err|warning|notice|info|debug)\b", re.IGNORECASE)
+# Canonical (interned) level names; the common all-lowercase spelling skips .lower().
+_LEVEL_NAMES = {
+    name: name
+    for name in ("emerg", "alert", "crit", "err", "warning", "notice", "info", "debug")
+}
+# journald PRIORITY values "0".."7" -> level names
+_PRIORITY_NAMES = {str(i): name for i, name in enumerate(_LEVEL_NAMES)}
+
+
+@dataclass(slots=True)
 class LogEntry:
-    """Represents a single parsed log entry."""
+    """Represents a single parsed log entry.
+
+    One is allocated per kept line, so it uses slots and leaves ``extra``
+    as None until something needs to store metadata on it. TemplateCache
+    only sets it for repeated lines, so readers treat None as a count of 1.
+    """
 
     source: str
     message: str
     raw: str
     timestamp: Optional[datetime] = None
     level: str = "info"
-    extra: dict = field(default_factory=dict)
+    extra: dict | None = None
+
+
+def parse_level(line: str) -> str:
+    """Return the first syslog level keyword in *line*, lowercased, or "info"."""
+    match = _LEVEL_RE.search(line)
+    if match is None:
+        return "info"
+    level = match.group(1)
+    return _LEVEL_NAMES.get(level) or _LEVEL_NAMES[level.lower()]
+
+
+def _log(message: str) -> None:
+    with _console_lock:
+        console.log(message, _stack_offset=2)
 
 
-def run_command(cmd: list[str], timeout: int = 30) -> str:
-    """Run a subprocess command, return stdout; log stderr to console."""
+def _kill_group(proc: subprocess.Popen) -> None:
+    """SIGKILL *proc* and everything it spawned into its process group."""
+    if proc.returncode is not None:
+        return
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            check=False,
-            encoding="utf-8",
-        )
-        if result.stderr:
-            console.log(f"[dim]stderr from {cmd[0]}: {result.stderr[:200]}[/dim]")
-        return result.stdout
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def iter_command_lines(cmd: list[str], timeout: int = 30) -> Iterator[str]:
+    """Run a subprocess and yield stdout lines as they arrive; log stderr to console.
+
+    Callers can filter while the command is still writing instead of holding
+    its whole output in memory. The process is killed after *timeout* seconds;
+    lines read before that point are still yielded. The generator's return
+    value is True only if the command ran to completion and exited 0.
+    """
+    try:
+        with tempfile.TemporaryFile() as err:
+            # No preexec_fn/user/group/umask: with those left unset CPython
+            # launches via vfork() (or posix_spawn), so the interpreter's
+            # page tables are never copied. Keep it that way.
+            # start_new_session puts the command in its own process group, so
+            # a timeout also kills children (e.g. under sh -c) that would
+            # otherwise hold stdout open and block the read past the deadline.
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=err,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                start_new_session=True,
+            )
+            killed = threading.Event()
+
+            def _kill() -> None:
+                killed.set()
+                _kill_group(proc)
+
+            deadline = time.monotonic() + timeout
+            timer = threading.Timer(timeout, _kill)
+            timer.start()
+            finished = False
+            try:
+                assert proc.stdout is not None
+                yield from proc.stdout
+                finished = True
+            finally:
+                if finished:
+                    # EOF on stdout does not mean the command has exited (it
+                    # may not be reaped yet, or still be working after closing
+                    # stdout), so give it the rest of the timeout to finish.
+                    try:
+                        proc.wait(max(deadline - time.monotonic(), 0))
+                    except subprocess.TimeoutExpired:
+                        killed.set()
+                timer.cancel()
+                if proc.poll() is None:
+                    _kill_group(proc)  # timed out, or the caller stopped early
+                proc.stdout.close()
+                proc.wait()
+            if killed.is_set():
+                _log(f"[yellow]Command timed out: {' '.join(cmd)}[/yellow]")
+                return False
+            err.seek(0)
+            stderr = err.read(200).decode("utf-8", "replace")
+            if stderr:
+                _log(f"[dim]stderr from {cmd[0]}: {stderr}[/dim]")
+            return proc.returncode == 0
     except FileNotFoundError:
-        console.log(f"[yellow]Command not found: {cmd[0]}[/yellow]")
-        return ""
-    except subprocess.TimeoutExpired:
-        console.log(f"[yellow]Command timed out: {' '.join(cmd)}[/yellow]")
-        return ""
+        _log(f"[yellow]Command not found: {cmd[0]}[/yellow]")
     except Exception as e:  # pylint: disable=broad-except
-        console.log(f"[red]Error running {cmd[0]}: {e}[/red]")
-        return ""
+        _log(f"[red]Error running {cmd[0]}: {e}[/red]")
+    return False
+
+
+def _run_to_end(cmd: list[str], timeout: int) -> tuple[str, bool]:
+    """Return (stdout, completed-successfully) for *cmd*."""
+    lines = []
+    gen = iter_command_lines(cmd, timeout)
+    while True:
+        try:
+            lines.append(next(gen))
+        except StopIteration as done:
+            return "".join(lines), bool(done.value)
+
+
+def run_command(cmd: list[str], timeout: int = 30, cacheable: bool = False) -> str:
+    """Run a subprocess command, return stdout; log stderr to console.
+
+    Use for vendor-tool snapshots where the whole output is wanted at once;
+    prefer iter_command_lines() for large streams, and iter_journal() for journalctl.
+    Pass *cacheable* for a command that detection and a collector both run:
+    a successful run's output is then reused for identical argv within 30
+    seconds. Failed, timed-out or nonzero-exit runs are never reused.
+    """
+    if not cacheable:
+        return _run_to_end(cmd, timeout)[0]
+    key = tuple(cmd)
+    now = time.monotonic()
+    hit = _COMMAND_CACHE.get(key)
+    if hit is not None and now - hit[0] < _COMMAND_CACHE_TTL:
+        return hit[1]
+    output, ok = _run_to_end(cmd, timeout)
+    if ok:
+        _COMMAND_CACHE[key] = (now, output)
+    return output
+
+
+def iter_journal(
+    args: list[str], timeout: int = 30, lines: Optional[int] = None
+) -> Iterator[tuple[str, str, Optional[datetime]]]:
+    """Run journalctl with *args* and yield (message, level, timestamp) per entry.
+
+    Output is JSON restricted to MESSAGE, PRIORITY, SYSLOG_IDENTIFIER and
+    _PID, so journald does not format a timestamp and hostname for every
+    line and the level comes from the entry's real priority rather than
+    keyword-matching its text. Entries without a PRIORITY fall back to
+    parse_level(). Messages keep the ``ident[pid]: `` prefix of the short
+    format, since the program name is often the key context. Empty messages
+    are skipped.
+
+    *lines* caps the output to the newest N entries (after any --grep), so a
+    noisy host cannot stream more than we will ingest before the timeout.
+    """
+    cmd = [
+        "journalctl", *args, "--no-pager", "--all",
+        "-o", "json", "--output-fields=MESSAGE,PRIORITY,SYSLOG_IDENTIFIER,_PID",
+    ]
+    if lines is not None:
+        cmd += ["--lines", str(lines)]
+    for line in iter_command_lines(cmd, timeout):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        message = record.get("MESSAGE")
+        if isinstance(message, list):  # non-UTF-8 payloads arrive as byte arrays
+            message = bytes(message).decode("utf-8", "replace")
+        if not message:
+            continue
+        message = message.strip()
+        if not message:
+            continue
+        level = _PRIORITY_NAMES.get(record.get("PRIORITY")) or parse_level(message)
+        ident = record.get("SYSLOG_IDENTIFIER")
+        if isinstance(ident, str) and ident:
+            pid = record.get("_PID")
+            message = f"{ident}[{pid}]: {message}" if isinstance(pid, str) else f"{ident}: {message}"
+        usec = record.get("__REALTIME_TIMESTAMP")
+        timestamp = datetime.fromtimestamp(int(usec) / 1_000_000) if usec else None
+        yield message, level, timestamp
+
+
+def tail_bytes(path: str, n: int, block: int = 65536, end: Optional[int] = None) -> bytes:
+    """Return the last *n* lines of *path* as raw bytes, without a trailing newline.
+
+    Seeks backwards from the end in *block*-sized chunks until enough newlines
+    have been seen, so cost scales with the tail size rather than the file
+    size. Nothing is decoded, so callers can filter with bytes patterns and
+    decode only the lines they keep. Pass *end* to treat the file as ending
+    at that offset, ignoring anything appended since it was measured.
+    Raises OSError like open().
+    """
+    if n <= 0:
+        return b""
+    with open(path, "rb") as fh:
+        pos = fh.seek(0, os.SEEK_END)
+        if end is not None:
+            pos = min(pos, end)
+        buf = b""
+        newlines = 0
+        while pos > 0 and newlines <= n:
+            step = min(block, pos)
+            pos -= step
+            fh.seek(pos)
+            chunk = fh.read(step)
+            newlines += chunk.count(b"\n")
+            buf = chunk + buf
+    lines = buf.split(b"\n")
+    if not lines[-1]:
+        lines.pop()
+    return b"\n".join(lines[-n:])
+
+
+def gather_entries(
+    tasks: list[Callable[[], list[LogEntry]]],
+    max_workers: int = _MAX_WORKERS,
+) -> list[LogEntry]:
+    """Run independent collection tasks on a thread pool.
+
+    The tasks are I/O-bound (subprocesses, file reads), so they overlap well
+    despite the GIL. Results are concatenated in task order, not completion
+    order, so output stays grouped by source.
+    """
+    if not tasks:
+        return []
+    entries: list[LogEntry] = []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as ex:
+        futures = [ex.submit(task) for task in tasks]
+        for future in futures:
+            entries.extend(future.result())
+    return entries
 
 
 class BaseCollector(ABC):
     """Abstract base class for all log collectors."""
 
+    def __init__(self) -> None:
+        # path -> (st_ino, st_size, offset consumed) from the last read
+        self._offsets: dict[str, tuple[int, int, int]] = {}
+
+    def read_since_checkpoint(self, path: str, n: Optional[int]) -> bytes:
+        """Return raw bytes appended to *path* since this collector last read it.
+
+        The first read, or one after rotation (new inode or shrunk file),
+        returns the last *n* lines instead (the whole file when *n* is None).
+        Later reads only touch the bytes added since, capped at *n* lines.
+        Every read stops at the size measured by its stat(), so data appended
+        meanwhile is left for the next call, and holds back a trailing partial
+        line until it is complete, so a line being written is never split in
+        two. A file whose size has not changed is treated as having nothing
+        new, even if its mtime moved. The result has no trailing newline.
+        Raises OSError like open().
+
+        Offsets live on the collector instance, so this only saves work for
+        callers that keep one collector across several collect() calls.
+        """
+        st = os.stat(path)
+        prev = self._offsets.get(path)
+        if prev is not None and prev[0] == st.st_ino and prev[1] == st.st_size:
+            return b""
+        if prev is None or prev[0] != st.st_ino or st.st_size < prev[1]:
+            if n is None:
+                with open(path, "rb") as fh:
+                    data = fh.read(st.st_size)
+                cut = data.rfind(b"\n") + 1
+                offset = cut
+                data = data[:cut - 1] if cut else b""
+            else:
+                with open(path, "rb") as fh:
+                    fh.seek(max(st.st_size - 1, 0))
+                    complete = fh.read(1) in (b"\n", b"")
+                if complete:
+                    data = tail_bytes(path, n, end=st.st_size)
+                    offset = st.st_size
+                else:
+                    # One extra line, since the last is the held-back fragment
+                    data = tail_bytes(path, n + 1, end=st.st_size)
+                    cut = data.rfind(b"\n")
+                    offset = st.st_size - (len(data) - cut - 1)
+                    data = data[:cut] if cut >= 0 else b""
+        else:
+            with open(path, "rb") as fh:
+                fh.seek(prev[2])
+                data = fh.read(st.st_size - prev[2])
+            cut = data.rfind(b"\n") + 1
+            offset = prev[2] + cut
+            lines = data[:cut].split(b"\n")[:-1]
+            data = b"\n".join(lines if n is None else lines[-n:])
+        self._offsets[path] = (st.st_ino, st.st_size, offset)
+        return data
+
+    def read_lines_since_checkpoint(self, path: str, n: Optional[int]) -> list[bytes]:
+        """Undecoded line-list form of read_since_checkpoint()."""
+        data = self.read_since_checkpoint(path, n)
+        return data.split(b"\n") if data else []
+
     @abstractmethod
     def collect(self, hours: int) -> list[LogEntry]:
         """Collect log entries from the past N hours."""
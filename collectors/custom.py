@@ -1,17 +1,54 @@
 """Collector for user-defined custom log sources from templates."""
 
 import glob as globmod
-import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
 
-from collectors.base import BaseCollector, LogEntry
+from collectors.base import BaseCollector, LogEntry, console, tail_bytes
+from collectors.templates import TemplateCache
+
+_READ_WORKERS = 16
+# Tails read ahead of the filter loop; bounds how many are held in memory at once
+_READ_AHEAD = _READ_WORKERS * 2
+
+
+def _read_tail(path: str, n: int) -> bytes | None:
+    try:
+        return tail_bytes(path, n)
+    except OSError:
+        return None
+
+
+def _iter_tails(ex: ThreadPoolExecutor, paths: list[str], n: int) -> Iterator[bytes | None]:
+    """Yield the last *n* lines of each path in order, reading ahead on *ex*.
+
+    Only _READ_AHEAD tails are in flight or waiting at any time, so a glob
+    over thousands of files never holds all of their tails at once.
+    """
+    remaining = iter(paths)
+    pending = deque(ex.submit(_read_tail, p, n) for p in islice(remaining, _READ_AHEAD))
+    while pending:
+        data = pending.popleft().result()
+        path = next(remaining, None)
+        if path is not None:
+            pending.append(ex.submit(_read_tail, path, n))
+        yield data
 
 
 class CustomSourceCollector(BaseCollector):
     """Collects log lines from user-defined file paths and globs."""
 
     def __init__(self, sources: list) -> None:
+        super().__init__()
         # sources: list[CustomSource] — typed loosely to avoid circular import
         self._sources = sources
+        # Filters are compiled when the CustomSource is created; an invalid
+        # one is reported here and then matches every line.
+        for src in sources:
+            if src.filter_error:
+                console.log(f"[red]Bad filter pattern for {src.name}: {src.filter_error}[/red]")
 
     def get_name(self) -> str:
         return "Custom Sources"
@@ -23,40 +60,36 @@ class CustomSourceCollector(BaseCollector):
         return [s.describe() for s in self._sources]
 
     def collect(self, hours: int) -> list[LogEntry]:
-        entries: list[LogEntry] = []
         line_count = max(500, hours * 100)
-        for src in self._sources:
-            entries.extend(self._collect_source(src, line_count))
+        globbed = [(src, sorted(globmod.glob(src.path_glob))) for src in self._sources]
+        # Globs can expand to thousands of files (e.g. one per container); read
+        # the tails on a thread pool so the open/seek/read syscalls overlap,
+        # filtering each one as it arrives rather than holding them all.
+        total = sum(len(src_paths) for _, src_paths in globbed)
+        entries: list[LogEntry] = []
+        if not total:
+            return entries
+        with ThreadPoolExecutor(max_workers=min(_READ_WORKERS, total)) as ex:
+            for src, src_paths in globbed:
+                entries.extend(self._collect_source(src, _iter_tails(ex, src_paths, line_count)))
         return entries
 
-    def _collect_source(self, src, line_count: int) -> list[LogEntry]:
-        pattern = None
-        if src.filter_pattern:
-            try:
-                pattern = re.compile(src.filter_pattern, re.IGNORECASE)
-            except re.error:
-                pattern = None
-
-        paths = globmod.glob(src.path_glob)
-        entries = []
-        for path in sorted(paths):
-            try:
-                with open(path, encoding="utf-8", errors="replace") as fh:
-                    lines = fh.readlines()[-line_count:]
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    if pattern and not pattern.search(line):
-                        continue
-                    entries.append(
-                        LogEntry(
-                            source=f"custom:{src.name}",
-                            message=line,
-                            raw=line,
-                            level=src.default_level,
-                        )
-                    )
-            except OSError:
+    def _collect_source(self, src, tails: Iterable[bytes | None]) -> list[LogEntry]:
+        match_line = src.match_line
+        source = f"custom:{src.name}"
+        level = src.default_level.lower()
+        cache = TemplateCache()
+        for data in tails:
+            if not data:
                 continue
-        return entries
+            # The filter is a user regex over text (\w, case folding and \u
+            # escapes are Unicode-aware), so the tail is decoded in one call
+            # before it is split and searched.
+            for line in data.decode("utf-8", "replace").split("\n"):
+                line = line.strip()
+                if not line:
+                    continue
+                if not match_line(line):
+                    continue
+                cache.add(source, line, level)
+        return cache.entries()
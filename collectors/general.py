@@ -2,15 +2,22 @@
 
 import re
 
-from collectors.base import BaseCollector, LogEntry, run_command
+from collectors.base import (
+    BaseCollector,
+    LogEntry,
+    gather_entries,
+    iter_journal,
+    parse_level,
+    run_command,
+)
+from collectors.templates import TemplateCache
 
-_LEVEL_RE = re.compile(r"\b(emerg|alert|crit|err|warning|notice|info|debug)\b", re.IGNORECASE)
 _OOM_RE = re.compile(r"oom|killed process|panic|oops", re.IGNORECASE)
-
-
-def _parse_level(line: str) -> str:
-    match = _LEVEL_RE.search(line)
-    return match.group(1).lower() if match else "info"
+# Bytes patterns: log files are filtered undecoded and only hits are decoded.
+# Shared prefixes are factored out so each position is tried once per stem
+# ("crit" already covers "critical").
+_AUTH_KW_RE = re.compile(rb"fail(?:ed|ure)|invalid|error|refused", re.IGNORECASE)
+_KERN_KW_RE = re.compile(rb"crit|err(?:or|\])", re.IGNORECASE)
 
 
 class GeneralCollector(BaseCollector):
@@ -32,74 +39,44 @@ class GeneralCollector(BaseCollector):
         ]
 
     def collect(self, hours: int) -> list[LogEntry]:
-        entries: list[LogEntry] = []
         since = f"{hours} hours ago"
-
-        entries.extend(self._collect_errors(since))
-        entries.extend(self._collect_oom(since))
-        entries.extend(self._collect_auth(hours))
-        entries.extend(self._collect_failed_units())
-        entries.extend(self._collect_kern_log(hours))
-
-        return entries
-
-    def _collect_errors(self, since: str) -> list[LogEntry]:
-        output = run_command(
-            ["journalctl", "-p", "err..emerg", "--since", since, "--no-pager", "-o", "short-iso"],
-            timeout=30,
-        )
-        entries = []
-        for line in output.splitlines():
-            line = line.strip()
-            if not line or line.startswith("--"):
-                continue
-            entries.append(
-                LogEntry(
-                    source="journalctl:errors",
-                    message=line,
-                    raw=line,
-                    level=_parse_level(line),
-                )
-            )
-        return entries
-
-    def _collect_oom(self, since: str) -> list[LogEntry]:
-        output = run_command(
-            ["journalctl", "-k", "--since", since, "--no-pager", "-o", "short-iso"],
+        line_count = max(500, hours * 100)
+        return gather_entries([
+            lambda: self._collect_errors(since, line_count),
+            lambda: self._collect_oom(since, line_count),
+            lambda: self._collect_auth(hours),
+            self._collect_failed_units,
+            lambda: self._collect_kern_log(hours),
+        ])
+
+    def _collect_errors(self, since: str, line_count: int) -> list[LogEntry]:
+        cache = TemplateCache()
+        for message, level, ts in iter_journal(
+            ["-p", "err..emerg", "--since", since], timeout=30, lines=line_count
+        ):
+            cache.add("journalctl:errors", message, level, ts)
+        return cache.entries()
+
+    def _collect_oom(self, since: str, line_count: int) -> list[LogEntry]:
+        cache = TemplateCache()
+        for message, _, ts in iter_journal(
+            ["-k", "--since", since, "--grep", _OOM_RE.pattern, "--case-sensitive=false"],
             timeout=30,
-        )
-        entries = []
-        for line in output.splitlines():
-            if _OOM_RE.search(line):
-                entries.append(
-                    LogEntry(
-                        source="journalctl:oom",
-                        message=line.strip(),
-                        raw=line.strip(),
-                        level="crit",
-                    )
-                )
-        return entries
+            lines=line_count,
+        ):
+            cache.add("journalctl:oom", message, "crit", ts)
+        return cache.entries()
 
     def _collect_auth(self, hours: int) -> list[LogEntry]:
         line_count = max(200, hours * 50)
         for auth_path in ["/var/log/auth.log", "/var/log/secure"]:
             try:
-                with open(auth_path, encoding="utf-8") as fh:
-                    lines = fh.readlines()
-                entries = []
-                for line in lines[-line_count:]:
-                    lower = line.lower()
-                    if any(kw in lower for kw in ("failed", "failure", "invalid", "error", "refused")):
-                        entries.append(
-                            LogEntry(
-                                source=auth_path,
-                                message=line.strip(),
-                                raw=line.strip(),
-                                level="warning",
-                            )
-                        )
-                return entries
+                lines = self.read_lines_since_checkpoint(auth_path, line_count)
+                cache = TemplateCache()
+                for line in lines:
+                    if _AUTH_KW_RE.search(line):
+                        cache.add(auth_path, line.decode("utf-8", "replace").strip(), "warning")
+                return cache.entries()
             except OSError:
                 continue
         return []
@@ -128,20 +105,12 @@ class GeneralCollector(BaseCollector):
     def _collect_kern_log(self, hours: int) -> list[LogEntry]:
         line_count = max(500, hours * 100)
         try:
-            with open("/var/log/kern.log", encoding="utf-8") as fh:
-                lines = fh.readlines()
-            entries = []
-            for line in lines[-line_count:]:
-                lower = line.lower()
-                if any(kw in lower for kw in ("critical", "error", "err]", "crit")):
-                    entries.append(
-                        LogEntry(
-                            source="/var/log/kern.log",
-                            message=line.strip(),
-                            raw=line.strip(),
-                            level=_parse_level(line),
-                        )
-                    )
-            return entries
+            lines = self.read_lines_since_checkpoint("/var/log/kern.log", line_count)
+            cache = TemplateCache()
+            for line in lines:
+                if _KERN_KW_RE.search(line):
+                    line = line.decode("utf-8", "replace").strip()
+                    cache.add("/var/log/kern.log", line, parse_level(line))
+            return cache.entries()
         except OSError:
             return []
@@ -1,10 +1,18 @@
 """GPU/ML workload log collector — NVIDIA and AMD."""
 
-import glob as globmod
 import os
 import re
-
-from collectors.base import BaseCollector, LogEntry, run_command
+from typing import Iterator
+
+from collectors.base import (
+    BaseCollector,
+    LogEntry,
+    gather_entries,
+    iter_journal,
+    parse_level,
+    run_command,
+)
+from collectors.templates import TemplateCache
 
 _ANSI_RE = re.compile(r"\x1b\[[0-9;]*[mGKHF]")
 
@@ -58,6 +66,13 @@ _OOM_GPU_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Kernel + workload layers fused so file tails are scanned in a single pass;
+# bytes so the tail is searched before any of it is decoded
+_GPU_LOG_RE = re.compile(
+    f"(?:{_KERNEL_GPU_RE.pattern})|(?:{_WORKLOAD_RE.pattern})".encode(),
+    re.IGNORECASE,
+)
+
 # Cmdline patterns that indicate a process is doing GPU compute
 _GPU_PROC_RE = re.compile(
     r"torch|tensorflow|jax|mxnet|paddle|"
@@ -72,16 +87,36 @@ _GPU_PROC_RE = re.compile(
     re.IGNORECASE,
 )
 
-_LEVEL_RE = re.compile(r"\b(emerg|alert|crit|err|warning|notice|info|debug)\b", re.IGNORECASE)
-
-
-def _parse_level(line: str) -> str:
-    match = _LEVEL_RE.search(line)
-    return match.group(1).lower() if match else "info"
-
-
-def _filter_lines(output: str, pattern: re.Pattern) -> list[str]:
-    return [l.strip() for l in output.splitlines() if l.strip() and pattern.search(l)]
+# vendor tool / Xorg keyword classifiers
+_ROCM_ERR_RE = re.compile(r"error|fault|hang|reset|throttl", re.IGNORECASE)
+_ROCM_WARN_RE = re.compile(r"warn|degraded|critical", re.IGNORECASE)
+_RAS_RE = re.compile(r"correctable", re.IGNORECASE)  # also matches "uncorrectable"
+_XORG_ERR_RE = re.compile(rb"\(ee\)", re.IGNORECASE)
+_XORG_WARN_RE = re.compile(rb"\(ww\)", re.IGNORECASE)
+
+
+def _scan_lines(text: bytes, pattern: re.Pattern) -> Iterator[bytes]:
+    """Yield each line of *text* that the bytes *pattern* matches.
+
+    Searches the whole buffer rather than line by line, so the regex engine
+    skips non-matching stretches in C and Python only touches matching lines.
+    """
+    pos = 0
+    search = pattern.search
+    while True:
+        match = search(text, pos)
+        if match is None:
+            return
+        start = text.rfind(b"\n", 0, match.start()) + 1
+        end = text.find(b"\n", match.start())
+        if end == -1:
+            end = len(text)
+        # "\s" classes can run across a newline; keep only line-local matches.
+        if match.end() > end and not search(text, start, end):
+            pos = end + 1
+            continue
+        yield text[start:end]
+        pos = end + 1
 
 
 class GpuCollector(BaseCollector):
@@ -107,50 +142,51 @@ class GpuCollector(BaseCollector):
 
     def collect(self, hours: int) -> list[LogEntry]:
         since = f"{hours} hours ago"
-        entries: list[LogEntry] = []
-        entries.extend(self._collect_kernel(since))
-        entries.extend(self._collect_workload_journal(since))
-        entries.extend(self._collect_syslog(hours))
-        entries.extend(self._collect_rocm_smi())
-        entries.extend(self._collect_nvidia_smi())
-        entries.extend(self._collect_gpu_processes())
-        entries.extend(self._collect_gpu_services(since))
-        entries.extend(self._collect_xorg())
-        return entries
+        line_count = max(500, hours * 100)
+        return gather_entries([
+            lambda: self._collect_kernel(since, line_count),
+            lambda: self._collect_workload_journal(since, line_count),
+            lambda: self._collect_syslog(hours),
+            self._collect_rocm_smi,
+            self._collect_nvidia_smi,
+            self._collect_gpu_processes,
+            lambda: self._collect_gpu_services(since, line_count),
+            self._collect_xorg,
+        ])
 
     # ── kernel hardware layer ──────────────────────────────────────────────
 
-    def _collect_kernel(self, since: str) -> list[LogEntry]:
-        output = run_command(
-            ["journalctl", "-k", "--since", since, "--no-pager", "-o", "short-iso"],
+    def _collect_kernel(self, since: str, line_count: int) -> list[LogEntry]:
+        cache = TemplateCache()
+        for message, level, ts in iter_journal(
+            ["-k", "--since", since, "--grep", _KERNEL_GPU_RE.pattern, "--case-sensitive=false"],
             timeout=30,
-        )
-        return [
-            LogEntry(source="journalctl:kernel", message=l, raw=l, level=_parse_level(l))
-            for l in _filter_lines(output, _KERNEL_GPU_RE)
-        ]
+            lines=line_count,
+        ):
+            cache.add("journalctl:kernel", message, level, ts)
+        return cache.entries()
 
     def _collect_syslog(self, hours: int) -> list[LogEntry]:
         line_count = max(1000, hours * 200)
         for path in ["/var/log/syslog", "/var/log/messages"]:
             try:
-                with open(path, encoding="utf-8") as fh:
-                    lines = fh.readlines()[-line_count:]
-                return [
-                    LogEntry(source=path, message=l.strip(), raw=l.strip(), level=_parse_level(l))
-                    for l in lines
-                    if _KERNEL_GPU_RE.search(l) or _WORKLOAD_RE.search(l)
-                ]
+                text = self.read_since_checkpoint(path, line_count)
+                cache = TemplateCache()
+                for line in _scan_lines(text, _GPU_LOG_RE):
+                    line = line.decode("utf-8", "replace").strip()
+                    cache.add(path, line, parse_level(line))
+                return cache.entries()
             except OSError:
                 continue
         return []
 
     # ── application / workload layer ──────────────────────────────────────
 
-    def _collect_workload_journal(self, since: str) -> list[LogEntry]:
+    def _collect_workload_journal(self, since: str, line_count: int) -> list[LogEntry]:
         """Journalctl user-space entries matching GPU-intensive workloads.
 
-        Uses --grep for each keyword cluster so we never pull the full journal.
+        The keyword clusters are joined into a single --grep alternation so the
+        journal is opened and scanned once, and we never pull the full journal.
         """
         grep_patterns = [
             "cuda|hip|rocm|nccl",
@@ -159,61 +195,33 @@ class GpuCollector(BaseCollector):
             "gpu.hang|gpu.reset|throttl|oom.kill",
             "stable.diffusion|comfyui|steam.*error|dxvk|vkd3d",
         ]
-        entries: list[LogEntry] = []
-        seen: set[str] = set()
-        for pattern in grep_patterns:
-            output = run_command(
-                [
-                    "journalctl", "--since", since, "--no-pager",
-                    "-o", "short-iso", "--grep", pattern,
-                    "--case-sensitive=false",
-                ],
-                timeout=20,
-            )
-            for line in output.splitlines():
-                line = line.strip()
-                if not line or line.startswith("--"):
-                    continue
-                if line not in seen:
-                    seen.add(line)
-                    entries.append(
-                        LogEntry(
-                            source="journalctl:workload",
-                            message=line,
-                            raw=line,
-                            level=_parse_level(line),
-                        )
-                    )
-        return entries
+        cache = TemplateCache()
+        for message, level, ts in iter_journal(
+            ["--since", since, "--grep", "|".join(grep_patterns), "--case-sensitive=false"],
+            timeout=30,
+            lines=line_count,
+        ):
+            cache.add("journalctl:workload", message, level, ts)
+        return cache.entries()
 
-    def _collect_gpu_services(self, since: str) -> list[LogEntry]:
+    def _collect_gpu_services(self, since: str, line_count: int) -> list[LogEntry]:
         """Pull full journal for known GPU service units."""
         services = ["ollama.service", "ollama", "vllm.service", "stable-diffusion.service"]
-        entries = []
+        cache = TemplateCache()
         for svc in services:
-            output = run_command(
-                ["journalctl", "-u", svc, "--since", since, "--no-pager", "-o", "short-iso"],
-                timeout=15,
-            )
-            for line in output.splitlines():
-                line = line.strip()
-                if line and not line.startswith("--"):
-                    entries.append(
-                        LogEntry(
-                            source=f"journalctl:{svc}",
-                            message=line,
-                            raw=line,
-                            level=_parse_level(line),
-                        )
-                    )
-        return entries
+            source = f"journalctl:{svc}"
+            for message, level, ts in iter_journal(
+                ["-u", svc, "--since", since], timeout=15, lines=line_count
+            ):
+                cache.add(source, message, level, ts)
+        return cache.entries()
 
     def _collect_gpu_processes(self) -> list[LogEntry]:
         """Snapshot of running processes actively using GPU compute."""
         entries = []
 
-        # AMD: rocm-smi lists PIDs using the GPU
-        rocm_out = run_command(["rocm-smi", "--showpids"], timeout=10)
+        # AMD: rocm-smi lists PIDs using the GPU (detection ran the same probe)
+        rocm_out = run_command(["rocm-smi", "--showpids"], timeout=10, cacheable=True)
         if rocm_out:
             for line in rocm_out.splitlines():
                 line = line.strip()
@@ -238,19 +246,28 @@ class GpuCollector(BaseCollector):
     def _proc_cmdline_scan(self) -> list[LogEntry]:
         """Scan /proc/*/cmdline for known GPU-intensive process signatures."""
         found = []
-        for cmdline_path in globmod.glob("/proc/*/cmdline"):
+        try:
+            proc_entries = list(os.scandir("/proc"))
+        except OSError:
+            return found
+        for proc_entry in proc_entries:
+            pid = proc_entry.name
+            if not pid.isdigit():
+                continue
             try:
-                with open(cmdline_path, "rb") as fh:
-                    raw_bytes = fh.read(512)
-                cmdline = raw_bytes.replace(b"\x00", b" ").decode("utf-8", errors="replace").strip()
-                if _GPU_PROC_RE.search(cmdline):
-                    pid = os.path.basename(os.path.dirname(cmdline_path))
-                    msg = f"GPU-intensive process running: pid={pid} cmd={cmdline[:120]}"
-                    found.append(
-                        LogEntry(source="proc:cmdline", message=msg, raw=cmdline, level="info")
-                    )
+                fd = os.open(f"/proc/{pid}/cmdline", os.O_RDONLY)
+                try:
+                    raw_bytes = os.read(fd, 512)
+                finally:
+                    os.close(fd)
             except OSError:
                 continue
+            cmdline = raw_bytes.replace(b"\x00", b" ").decode("utf-8", errors="replace").strip()
+            if _GPU_PROC_RE.search(cmdline):
+                msg = f"GPU-intensive process running: pid={pid} cmd={cmdline[:120]}"
+                found.append(
+                    LogEntry(source="proc:cmdline", message=msg, raw=cmdline, level="info")
+                )
         return found
 
     # ── vendor query tools ────────────────────────────────────────────────
@@ -267,11 +284,10 @@ class GpuCollector(BaseCollector):
                 # Skip pure header/label rows (no digits = no actual data)
                 if not any(ch.isdigit() for ch in line):
                     continue
-                lower = line.lower()
                 level = "info"
-                if any(kw in lower for kw in ("error", "fault", "hang", "reset", "throttl")):
+                if _ROCM_ERR_RE.search(line):
                     level = "err"
-                elif any(kw in lower for kw in ("warn", "degraded", "critical")):
+                elif _ROCM_WARN_RE.search(line):
                     level = "warning"
                 entries.append(LogEntry(source="rocm-smi", message=line, raw=line, level=level))
 
@@ -281,9 +297,8 @@ class GpuCollector(BaseCollector):
             line = _ANSI_RE.sub("", raw_line).strip()
             if not line or line.startswith(("=", "W", "R", "G", "B", "_")):
                 continue
-            lower = line.lower()
             # Only emit if there are non-zero error counts
-            if any(kw in lower for kw in ("correctable", "uncorrectable")):
+            if _RAS_RE.search(line):
                 parts = line.split()
                 counts = [p for p in parts if p.isdigit() and int(p) > 0]
                 if counts:
@@ -301,28 +316,23 @@ class GpuCollector(BaseCollector):
         return [
             LogEntry(source="nvidia-smi", message=l, raw=l, level="err")
             for l in output.splitlines()
-            if l.strip()
+            if l and not l.isspace()
         ]
 
     # ── display / Xorg ────────────────────────────────────────────────────
 
     def _collect_xorg(self) -> list[LogEntry]:
         try:
-            with open("/var/log/Xorg.0.log", encoding="utf-8") as fh:
-                lines = fh.readlines()
-            entries = []
+            lines = self.read_lines_since_checkpoint("/var/log/Xorg.0.log", None)
+            cache = TemplateCache()
             for line in lines:
-                lower = line.lower()
-                if "(ee)" in lower or "(ww)" in lower:
-                    level = "err" if "(ee)" in lower else "warning"
-                    entries.append(
-                        LogEntry(
-                            source="/var/log/Xorg.0.log",
-                            message=line.strip(),
-                            raw=line.strip(),
-                            level=level,
-                        )
-                    )
-            return entries
+                if _XORG_ERR_RE.search(line):
+                    level = "err"
+                elif _XORG_WARN_RE.search(line):
+                    level = "warning"
+                else:
+                    continue
+                cache.add("/var/log/Xorg.0.log", line.decode("utf-8", "replace").strip(), level)
+            return cache.entries()
         except OSError:
             return []
@@ -1,22 +1,30 @@
 """NAS/storage log collector."""
 
 import re
-
-from collectors.base import BaseCollector, LogEntry, run_command
+from concurrent.futures import ThreadPoolExecutor
+
+from collectors.base import (
+    BaseCollector,
+    LogEntry,
+    gather_entries,
+    iter_journal,
+    parse_level,
+    run_command,
+)
+from collectors.templates import TemplateCache
 
 _STORAGE_RE = re.compile(
     r"ata|scsi|sd[a-z]|nvme|I/O error|ext4.error|xfs|zfs|btrfs|mdadm|raid",
     re.IGNORECASE,
 )
-_LEVEL_RE = re.compile(r"\b(emerg|alert|crit|err|warning|notice|info|debug)\b", re.IGNORECASE)
+# Bytes twin of _STORAGE_RE for filtering syslog before decoding
+_STORAGE_BYTES_RE = re.compile(_STORAGE_RE.pattern.encode(), re.IGNORECASE)
+_ZPOOL_ERR_RE = re.compile(r"degraded|faulted|offline|unavail|error", re.IGNORECASE)
+_ZPOOL_WARN_RE = re.compile(r"warning", re.IGNORECASE)
+_SMART_KW_RE = re.compile(r"error|fail|reallocated|uncorrectable|bad", re.IGNORECASE)
 _DEV_RE = re.compile(r"^(/dev/(sd[a-z]|nvme\d+n\d+))$")
 
 
-def _parse_level(line: str) -> str:
-    match = _LEVEL_RE.search(line)
-    return match.group(1).lower() if match else "info"
-
-
 class NasCollector(BaseCollector):
     """Collects NAS/storage-related log events: disks, ZFS, mdadm, SMART."""
 
@@ -36,53 +44,36 @@ class NasCollector(BaseCollector):
         ]
 
     def collect(self, hours: int) -> list[LogEntry]:
-        entries: list[LogEntry] = []
         since = f"{hours} hours ago"
-
-        entries.extend(self._collect_journalctl(since))
-        entries.extend(self._collect_syslog(hours))
-        entries.extend(self._collect_zpool())
-        entries.extend(self._collect_mdadm())
-        entries.extend(self._collect_smart())
-
-        return entries
-
-    def _collect_journalctl(self, since: str) -> list[LogEntry]:
-        output = run_command(
-            ["journalctl", "-k", "--since", since, "--no-pager", "-o", "short-iso"],
+        return gather_entries([
+            lambda: self._collect_journalctl(since, max(500, hours * 100)),
+            lambda: self._collect_syslog(hours),
+            self._collect_zpool,
+            self._collect_mdadm,
+            self._collect_smart,
+        ])
+
+    def _collect_journalctl(self, since: str, line_count: int) -> list[LogEntry]:
+        cache = TemplateCache()
+        for message, level, ts in iter_journal(
+            ["-k", "--since", since, "--grep", _STORAGE_RE.pattern, "--case-sensitive=false"],
             timeout=30,
-        )
-        entries = []
-        for line in output.splitlines():
-            if _STORAGE_RE.search(line):
-                entries.append(
-                    LogEntry(
-                        source="journalctl:kernel",
-                        message=line.strip(),
-                        raw=line.strip(),
-                        level=_parse_level(line),
-                    )
-                )
-        return entries
+            lines=line_count,
+        ):
+            cache.add("journalctl:kernel", message, level, ts)
+        return cache.entries()
 
     def _collect_syslog(self, hours: int) -> list[LogEntry]:
         line_count = max(1000, hours * 200)
         for syslog_path in ["/var/log/syslog", "/var/log/messages"]:
             try:
-                with open(syslog_path, encoding="utf-8") as fh:
-                    lines = fh.readlines()
-                entries = []
-                for line in lines[-line_count:]:
-                    if _STORAGE_RE.search(line):
-                        entries.append(
-                            LogEntry(
-                                source=syslog_path,
-                                message=line.strip(),
-                                raw=line.strip(),
-                                level=_parse_level(line),
-                            )
-                        )
-                return entries
+                lines = self.read_lines_since_checkpoint(syslog_path, line_count)
+                cache = TemplateCache()
+                for line in lines:
+                    if _STORAGE_BYTES_RE.search(line):
+                        line = line.decode("utf-8", "replace").strip()
+                        cache.add(syslog_path, line, parse_level(line))
+                return cache.entries()
             except OSError:
                 continue
         return []
@@ -96,11 +87,10 @@ class NasCollector(BaseCollector):
             line = line.strip()
             if not line:
                 continue
-            lower = line.lower()
             level = "info"
-            if any(kw in lower for kw in ("degraded", "faulted", "offline", "unavail", "error")):
+            if _ZPOOL_ERR_RE.search(line):
                 level = "err"
-            elif "warning" in lower:
+            elif _ZPOOL_WARN_RE.search(line):
                 level = "warning"
             entries.append(
                 LogEntry(
@@ -135,19 +125,25 @@ class NasCollector(BaseCollector):
         import glob as globmod
 
         devices = globmod.glob("/dev/sd?") + globmod.glob("/dev/nvme?n?")
+        if not devices:
+            return []
+        # Each smartctl call blocks on the drive for a second or more; query
+        # all devices at once so the total is the slowest drive, not the sum.
+        with ThreadPoolExecutor(max_workers=min(16, len(devices))) as ex:
+            outputs = list(ex.map(lambda d: run_command(["smartctl", "-a", d], timeout=20), devices))
         entries = []
-        for dev in devices:
-            output = run_command(["smartctl", "-a", dev], timeout=20)
+        for dev, output in zip(devices, outputs):
             if not output:
                 continue
+            source = f"smartctl:{dev}"
             for line in output.splitlines():
-                lower = line.lower()
-                if any(kw in lower for kw in ("error", "fail", "reallocated", "uncorrectable", "bad")):
+                if _SMART_KW_RE.search(line):
+                    line = line.strip()
                     entries.append(
                         LogEntry(
-                            source=f"smartctl:{dev}",
-                            message=line.strip(),
-                            raw=line.strip(),
+                            source=source,
+                            message=line,
+                            raw=line,
                             level="err",
                         )
                     )
@@ -9,7 +9,14 @@ import shutil
 from dataclasses import dataclass
 from typing import Literal
 
-from collectors.base import BaseCollector, LogEntry, run_command
+from collectors.base import (
+    BaseCollector,
+    LogEntry,
+    iter_command_lines,
+    iter_journal,
+    run_command,
+)
+from collectors.templates import TemplateCache
 
 # Container runtimes: (binary name, args to list containers).
 # List command must output lines like "ID\tNAME" for matching.
@@ -109,19 +116,16 @@ def _collect_single_container_logs(
     runtime_bin: str, cid: str, display_name: str, since: str
 ) -> list[LogEntry]:
     """Fetch logs for one container; return list of LogEntry."""
-    out = run_command(
+    source = f"container:{display_name}"
+    cache = TemplateCache()
+    for line in iter_command_lines(
         [runtime_bin, "logs", "--since", since, cid],
         timeout=60,
-    )
-    source = f"container:{display_name}"
-    entries: list[LogEntry] = []
-    for line in out.splitlines():
+    ):
         line = line.strip()
         if line:
-            entries.append(
-                LogEntry(source=source, message=line, raw=line, level="info")
-            )
-    return entries
+            cache.add(source, line, "info")
+    return cache.entries()
 
 
 def _collect_multi_container_logs(
@@ -193,6 +197,7 @@ class ProcessTargetCollector(BaseCollector):
     """Collects logs for a single process target (PID, systemd unit, or container)."""
 
     def __init__(self, target: ProcessTarget, hours: int) -> None:
+        super().__init__()
         self._target = target
         self._hours = hours
 
@@ -215,42 +220,30 @@ class ProcessTargetCollector(BaseCollector):
 
     def collect(self, hours: int) -> list[LogEntry]:
         since = f"{hours}h"
+        line_count = max(500, hours * 100)
         entries: list[LogEntry] = []
 
         if self._target.kind == "pid":
-            out = run_command(
-                [
-                    "journalctl",
-                    f"_PID={self._target.value}",
-                    "--since", since,
-                    "--no-pager", "-o", "short-iso",
-                ],
-                timeout=30,
-            )
+            cache = TemplateCache()
             source = f"journalctl:pid{self._target.value}"
-            for line in out.splitlines():
-                line = line.strip()
-                if line and not line.startswith("--"):
-                    entries.append(
-                        LogEntry(source=source, message=line, raw=line, level="info")
-                    )
+            for message, level, ts in iter_journal(
+                [f"_PID={self._target.value}", "--since", since],
+                timeout=30,
+                lines=line_count,
+            ):
+                cache.add(source, message, level, ts)
+            entries.extend(cache.entries())
 
         elif self._target.kind == "unit":
-            out = run_command(
-                [
-                    "journalctl", "-u", self._target.value,
-                    "--since", since,
-                    "--no-pager", "-o", "short-iso",
-                ],
-                timeout=30,
-            )
+            cache = TemplateCache()
             source = f"journalctl:{self._target.value}"
-            for line in out.splitlines():
-                line = line.strip()
-                if line and not line.startswith("--"):
-                    entries.append(
-                        LogEntry(source=source, message=line, raw=line, level="info")
-                    )
+            for message, level, ts in iter_journal(
+                ["-u", self._target.value, "--since", since],
+                timeout=30,
+                lines=line_count,
+            ):
+                cache.add(source, message, level, ts)
+            entries.extend(cache.entries())
 
         elif self._target.kind == "container" and self._target.runtime_bin:
             entries.extend(
@@ -273,7 +266,7 @@ class ProcessTargetCollector(BaseCollector):
                     )
                 )
         elif self._target.kind == "containers_selected" and self._target.runtime_bin:
-            ids = [s.strip() for s in self._target.value.split(",") if s.strip()]
+            ids = [s for s in (p.strip() for p in self._target.value.split(",")) if s]
             _, list_cmd = _find_container_runtime()
             id_to_name: dict[str, str] = {}
             if list_cmd:
@@ -2,9 +2,11 @@
 
 import os
 import re
+import selectors
 import subprocess
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
@@ -12,25 +14,68 @@ from rich.console import Console
 
 console = Console(stderr=True)
 
-# Severity keywords used to flag a line as noteworthy.
+# Severity keywords used to flag a line as noteworthy: (canonical name, pattern).
+_KEYWORDS = (
+    ("emerg", r"emerg"),
+    ("alert", r"alert"),
+    ("critical", r"crit(?:ical)?"),
+    ("error", r"err(?:or)?"),
+    ("failed", r"fail(?:ed|ure)?"),
+    ("panic", r"panic"),
+    ("oops", r"oops"),
+    ("oom", r"oom"),
+    ("segfault", r"segfault"),
+    ("timeout", r"timeout"),
+    ("refused", r"refused"),
+    ("denied", r"denied"),
+)
+# One capturing group per keyword, so m.lastindex identifies which one hit
+# and the canonical name is a tuple lookup instead of .lower() on the match.
+# Compiled as str, not bytes: in a bytes pattern \b is ASCII-only and would
+# treat "éerror" as a word boundary. Only prescreened lines are decoded for it.
 _ERROR_RE = re.compile(
-    r"\b(emerg|alert|crit(?:ical)?|err(?:or)?|fail(?:ed|ure)?|panic|oops|oom|segfault|timeout|refused|denied)\b",
+    r"\b(?:" + "|".join(f"({pattern})" for _, pattern in _KEYWORDS) + r")\b",
     re.IGNORECASE,
 )
+_SEARCH = _ERROR_RE.search
+_KEYWORD_BY_GROUP = (None,) + tuple(name for name, _ in _KEYWORDS)
+# Literal stem every keyword pattern starts with. Substring checks for these
+# run at memchr speed and rule out quiet chunks before the regex sees them.
+_KW_BYTES = (
+    b"emerg", b"alert", b"crit", b"err", b"fail", b"panic",
+    b"oops", b"oom", b"segfault", b"timeout", b"refused", b"denied",
+)
 
-# Files/directories to skip (binary, rotated archives, etc.)
-_SKIP_SUFFIXES = {".gz", ".xz", ".bz2", ".zst", ".1", ".2", ".3", ".4"}
+# Files/directories to skip (binary, rotated archives such as .gz or .log.12, etc.)
+_SKIP_SUFFIX_RE = re.compile(r"\.(?:gz|xz|bz2|zst|\d+)$")
 _SKIP_NAMES = {"btmp", "wtmp", "lastlog", "faillog"}
 
+# Bytes pulled per os.read() call, and how often tailed files are re-checked.
+_READ_SIZE = 65536
+_POLL_INTERVAL = 0.25
 
-@dataclass
+# Wall-clock anchor for turning monotonic hit times back into datetimes.
+_WALL_BASE = time.time()
+_MONO_BASE_NS = time.monotonic_ns()
+
+
+@dataclass(slots=True)
 class ScoutHit:
-    """A single noteworthy line captured during scouting."""
+    """A single noteworthy line captured during scouting.
+
+    Only a monotonic clock reading is taken per hit; the UTC datetime is
+    derived on access.
+    """
 
     source: str
     line: str
     keyword: str
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    mono_ns: int = field(default_factory=time.monotonic_ns)
+
+    @property
+    def timestamp(self) -> datetime:
+        wall = _WALL_BASE + (self.mono_ns - _MONO_BASE_NS) / 1e9
+        return datetime.fromtimestamp(wall, timezone.utc)
 
 
 @dataclass
@@ -39,14 +84,18 @@ class ScoutResult:
 
     duration_seconds: int
     hits: list[ScoutHit] = field(default_factory=list)
+    grouped: dict[str, list[ScoutHit]] | None = None
+    dropped: int = 0  # older hits evicted once max_hits was reached
 
     @property
     def sources(self) -> dict[str, list[ScoutHit]]:
-        """Group hits by source."""
-        grouped: dict[str, list[ScoutHit]] = {}
-        for hit in self.hits:
-            grouped.setdefault(hit.source, []).append(hit)
-        return grouped
+        """Group hits by source; built once, or taken from the scout if it grouped them."""
+        if self.grouped is None:
+            grouped: dict[str, list[ScoutHit]] = {}
+            for hit in self.hits:
+                grouped.setdefault(hit.source, []).append(hit)
+            self.grouped = grouped
+        return self.grouped
 
     @property
     def total(self) -> int:
@@ -56,12 +105,25 @@ class ScoutResult:
 class LogScout:
     """Monitors log files and journalctl in real-time, collecting error-level lines."""
 
-    def __init__(self, duration_seconds: int, log_dir: str = "/var/log") -> None:
+    def __init__(
+        self, duration_seconds: int, log_dir: str = "/var/log", max_hits: int = 50000
+    ) -> None:
         self.duration = duration_seconds
         self.log_dir = log_dir
-        self._hits: list[ScoutHit] = []
+        self.max_hits = max_hits
+        # Bounded so a log storm costs O(max_hits) memory: the oldest hits are
+        # overwritten and counted in _dropped.
+        self._hits: deque[ScoutHit] = deque(maxlen=max_hits)
+        self._dropped = 0
+        self._pending: deque[ScoutHit] = deque(maxlen=max_hits)
+        # Same hits grouped by source, kept in step with _hits as it evicts.
+        self._by_source: dict[str, deque[ScoutHit]] = {}
+        # Guards _hits/_by_source/_dropped between the watcher and result(),
+        # in case a thread is still running when a snapshot is taken.
         self._lock = threading.Lock()
+        self._wake = threading.Event()
         self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
 
     # ── public API ────────────────────────────────────────────────────────
 
@@ -72,120 +134,211 @@ class LogScout:
         each new hit so callers can show live progress.
         """
         self._hits.clear()
+        self._dropped = 0
+        self._pending.clear()
+        self._by_source.clear()
         self._stop.clear()
         self._on_hit = on_hit
 
-        threads: list[threading.Thread] = []
-
-        # Thread 1: journalctl -f
-        t_journal = threading.Thread(target=self._watch_journal, daemon=True)
-        threads.append(t_journal)
-
-        # Thread 2+: tail each readable log file
-        for path in self._discover_log_files():
-            t = threading.Thread(target=self._tail_file, args=(path,), daemon=True)
-            threads.append(t)
-
-        for t in threads:
-            t.start()
+        # One thread watches the journal and every tailed file; a second owns
+        # the callback so a slow renderer never stalls reading.
+        self._threads = [threading.Thread(target=self._watch_loop, daemon=True)]
+        if on_hit is not None:
+            self._threads.append(threading.Thread(target=self._dispatch_loop, daemon=True))
+        for thread in self._threads:
+            thread.start()
 
         # Wait for the scouting duration.
         self._stop.wait(timeout=self.duration)
-        self._stop.set()
-
-        # Give threads a moment to wind down.
-        for t in threads:
-            t.join(timeout=2)
-
-        return ScoutResult(duration_seconds=self.duration, hits=list(self._hits))
+        self.stop()
+        return self.result()
 
     def stop(self) -> None:
-        """Signal all watchers to stop early."""
+        """Signal all watchers to stop, then give each thread a moment to wind down.
+
+        Hits still queued for on_hit are discarded rather than delivered, so
+        no callback output follows the caller's own once stop() returns; they
+        remain in result().
+        """
         self._stop.set()
+        self._pending.clear()
+        self._wake.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=2)
+
+    def result(self) -> ScoutResult:
+        """Return the hits captured so far, e.g. after stopping early."""
+        with self._lock:
+            grouped = {source: list(hits) for source, hits in self._by_source.items() if hits}
+            hits = list(self._hits)
+            dropped = self._dropped
+        return ScoutResult(
+            duration_seconds=self.duration,
+            hits=hits,
+            grouped=grouped,
+            dropped=dropped,
+        )
 
     # ── internal ──────────────────────────────────────────────────────────
 
-    def _record(self, source: str, line: str, keyword: str) -> None:
-        hit = ScoutHit(source=source, line=line.strip(), keyword=keyword)
+    def _record(self, source: str, line: str, keyword: str, mono_ns: int) -> None:
+        hit = ScoutHit(source, line, keyword, mono_ns)
         with self._lock:
+            if len(self._hits) == self.max_hits:
+                # The ring is about to drop its oldest hit, which is also the
+                # oldest in that hit's source group.
+                self._by_source[self._hits[0].source].popleft()
+                self._dropped += 1
             self._hits.append(hit)
+            group = self._by_source.get(source)
+            if group is None:
+                group = self._by_source[source] = deque()
+            group.append(hit)
         if self._on_hit:
-            try:
-                self._on_hit(hit)
-            except Exception:  # pylint: disable=broad-except
-                pass
-
-    def _matches(self, line: str) -> str | None:
-        """Return the first error keyword found in *line*, or None."""
-        m = _ERROR_RE.search(line)
-        return m.group(1).lower() if m else None
+            self._pending.append(hit)
+            self._wake.set()
+
+    def _dispatch_loop(self) -> None:
+        """Deliver queued hits to the on_hit callback until stopped."""
+        while not self._stop.is_set():
+            self._wake.wait(timeout=_POLL_INTERVAL)
+            self._wake.clear()
+            while not self._stop.is_set():
+                try:
+                    hit = self._pending.popleft()
+                except IndexError:  # drained, or cleared by stop()
+                    break
+                try:
+                    self._on_hit(hit)
+                except Exception:  # pylint: disable=broad-except
+                    pass
 
     def _discover_log_files(self) -> list[str]:
         """Return readable text files under /var/log (non-recursive for safety)."""
         results: list[str] = []
         try:
             for entry in os.scandir(self.log_dir):
-                if not entry.is_file():
+                # Name checks first: they reject archives without any syscall.
+                name = entry.name
+                if name in _SKIP_NAMES or _SKIP_SUFFIX_RE.search(name):
                     continue
-                if entry.name in _SKIP_NAMES:
+                # Symlinks are skipped so a file is never tailed twice.
+                if not entry.is_file(follow_symlinks=False):
                     continue
-                if any(entry.name.endswith(s) for s in _SKIP_SUFFIXES):
+                # Quick binary check, as grep -I does: a NUL in the head.
+                # Unreadable files fail the open, so no separate access() call.
+                try:
+                    with open(entry.path, "rb") as fh:
+                        head = fh.read(4096)
+                except OSError:
                     continue
-                if os.access(entry.path, os.R_OK):
-                    # Quick binary check: try reading a small chunk.
-                    try:
-                        with open(entry.path, "r", encoding="utf-8") as fh:
-                            fh.read(256)
-                        results.append(entry.path)
-                    except (UnicodeDecodeError, OSError):
-                        continue
+                if b"\x00" in head:
+                    continue
+                results.append(entry.path)
         except OSError:
             pass
         return results
 
-    def _tail_file(self, path: str) -> None:
-        """Tail a single file, checking for new lines until stopped."""
-        try:
-            with open(path, "r", encoding="utf-8") as fh:
-                # Seek to end so we only see new content.
-                fh.seek(0, os.SEEK_END)
-                while not self._stop.is_set():
-                    line = fh.readline()
-                    if line:
-                        kw = self._matches(line)
-                        if kw:
-                            self._record(path, line, kw)
-                    else:
-                        # No new data — short sleep to avoid busy-loop.
-                        time.sleep(0.25)
-        except OSError:
-            pass
+    def _watch_loop(self) -> None:
+        """Follow ``journalctl -f`` and tail every log file from one thread.
 
-    def _watch_journal(self) -> None:
-        """Stream ``journalctl -f`` and capture error-level lines."""
+        The journal pipe is multiplexed with a selector so new output wakes
+        the loop immediately. Regular files are always "ready" to epoll/select,
+        so instead of one thread per file they are drained with bulk os.read()
+        calls once every _POLL_INTERVAL seconds, however often the journal
+        wakes the loop in between.
+        """
+        sel = selectors.DefaultSelector()
+        files: dict[int, str] = {}
+        partial: dict[int, bytes] = {}
+        proc = None
         try:
             proc = subprocess.Popen(
                 ["journalctl", "-f", "-o", "short-iso", "--no-pager"],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.DEVNULL,
-                text=True,
-                encoding="utf-8",
+                # The pipe is drained with os.read() on its fd; an unbuffered
+                # (raw) stdout guarantees no bytes sit in a Python-side buffer.
+                bufsize=0,
             )
+            assert proc.stdout is not None
+            sel.register(proc.stdout.fileno(), selectors.EVENT_READ, "journalctl")
         except FileNotFoundError:
-            return
+            pass
 
+        for path in self._discover_log_files():
+            try:
+                fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            except OSError:
+                continue
+            # Seek to end so we only see new content.
+            os.lseek(fd, 0, os.SEEK_END)
+            files[fd] = path
+
+        next_drain = 0.0
         try:
-            assert proc.stdout is not None
             while not self._stop.is_set():
-                line = proc.stdout.readline()
-                if not line:
-                    break
-                kw = self._matches(line)
-                if kw:
-                    self._record("journalctl", line, kw)
+                wait = max(next_drain - time.monotonic(), 0.0)
+                if sel.get_map():
+                    ready = sel.select(timeout=wait)
+                else:
+                    self._stop.wait(wait)
+                    ready = []
+                for key, _ in ready:
+                    chunk = os.read(key.fd, _READ_SIZE)
+                    if chunk:
+                        self._feed(key.fd, key.data, chunk, partial)
+                    else:
+                        sel.unregister(key.fd)
+                now = time.monotonic()
+                if now < next_drain:
+                    continue
+                next_drain = now + _POLL_INTERVAL
+                for fd, path in files.items():
+                    try:
+                        while chunk := os.read(fd, _READ_SIZE):
+                            self._feed(fd, path, chunk, partial)
+                    except OSError:
+                        continue
         finally:
-            proc.terminate()
-            try:
-                proc.wait(timeout=3)
-            except subprocess.TimeoutExpired:
-                proc.kill()
+            sel.close()
+            for fd in files:
+                os.close(fd)
+            if proc is not None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=3)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                proc.stdout.close()
+
+    def _feed(self, fd: int, source: str, chunk: bytes, partial: dict[int, bytes]) -> None:
+        """Scan the complete lines in *chunk*, carrying any trailing fragment over."""
+        data = partial.pop(fd, b"") + chunk
+        cut = data.rfind(b"\n") + 1
+        if cut < len(data):
+            partial[fd] = data[cut:]
+        if not cut:
+            return
+        # Prescreen: find the lines containing any keyword stem with plain
+        # substring search, then decode those alone for the word-boundary regex.
+        low = data[:cut].lower()
+        candidates: set[tuple[int, int]] = set()
+        for kw in _KW_BYTES:
+            i = low.find(kw)
+            while i != -1:
+                start = low.rfind(b"\n", 0, i) + 1
+                end = low.find(b"\n", i)
+                candidates.add((start, end))
+                i = low.find(kw, end + 1)
+        if not candidates:
+            return
+        # Every line in one read arrived together; stamp them with one clock read.
+        now_ns = time.monotonic_ns()
+        for start, end in sorted(candidates):
+            line = data[start:end].decode("utf-8", "replace")
+            m = _SEARCH(line)
+            if m is None:
+                continue
+            self._record(source, line.strip(), _KEYWORD_BY_GROUP[m.lastindex], now_ns)
@@ -0,0 +1,72 @@
+"""Log-line templating used to collapse repeated messages into one entry."""
+
+import re
+from datetime import datetime
+from typing import Optional
+
+from collectors.base import LogEntry
+
+# Variable tokens: ISO timestamps, IPv4 addresses, hex addresses, and
+# multi-digit numbers (PIDs, ports, counters, syslog clock fields).
+_VAR_RE = re.compile(
+    r"\d{4}-\d{2}-\d{2}T[\d:.,+-]+"
+    r"|\b(?:\d+\.\d+\.\d+\.\d+|0x[0-9a-fA-F]+|\d{2,})\b"
+)
+
+_MAX_SAMPLES = 3
+
+
+def templatize(line: str) -> str:
+    """Replace the variable tokens in *line* with ``<*>``."""
+    return _VAR_RE.sub("<*>", line)
+
+
+class TemplateCache:
+    """Collapses log lines that share a template into a single LogEntry.
+
+    The first line seen for a template becomes the entry's message/raw.
+    Templates seen more than once come back with ``extra["count"]`` (how many
+    lines matched) and ``extra["samples"]`` (up to three distinct examples);
+    one-off lines keep ``extra`` as None. Entries come back in first-seen order.
+
+    Duplicates are detected before any LogEntry is built, and templates are
+    keyed by their hash so the template strings themselves are not retained;
+    a collision would merge two templates, which is negligible at this scale.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[str, int], LogEntry] = {}
+        # [count, samples] for repeated templates only, attached by entries()
+        self._repeats: dict[tuple[str, int], list] = {}
+
+    def add(
+        self, source: str, line: str, level: str, timestamp: Optional[datetime] = None
+    ) -> None:
+        """Record *line*, merging it into an existing entry with the same template.
+
+        A merged entry keeps the level and *timestamp* of its first occurrence.
+        """
+        key = (source, hash(templatize(line)))
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = LogEntry(
+                source=source,
+                message=line,
+                raw=line,
+                timestamp=timestamp,
+                level=level,
+            )
+            return
+        repeat = self._repeats.get(key)
+        if repeat is None:
+            self._repeats[key] = [2, [entry.raw] if line == entry.raw else [entry.raw, line]]
+            return
+        repeat[0] += 1
+        samples = repeat[1]
+        if len(samples) < _MAX_SAMPLES and line not in samples:
+            samples.append(line)
+
+    def entries(self) -> list[LogEntry]:
+        for key, (count, samples) in self._repeats.items():
+            self._entries[key].extra = {"count": count, "samples": samples}
+        return list(self._entries.values())
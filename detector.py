@@ -1,10 +1,21 @@
 """System profile auto-detection for loglm_collector."""
 
+import glob as globmod
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 
 from collectors.base import run_command
 
+# External-tool probes: (name, argv, timeout, cacheable). They are independent,
+# so they run concurrently and detection takes as long as the slowest one.
+# rocm-smi --showpids is run again by the GPU collector, so it is cacheable.
+_PROBES = [
+    ("nvidia_smi", ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"], 10, False),
+    ("rocm_name", ["rocm-smi", "--showproductname"], 10, False),
+    ("rocm_pids", ["rocm-smi", "--showpids"], 10, True),
+]
+
 
 @dataclass  # pylint: disable=too-few-public-methods
 class ProfileDetection:
@@ -28,14 +39,48 @@ class DetectionResult:
         return None
 
 
+def _loaded_modules() -> str:
+    """Return the loaded kernel module list, lowercased.
+
+    lsmod only reformats /proc/modules, so read that directly and fall back
+    to exec'ing lsmod only when /proc is unavailable.
+    """
+    try:
+        with open("/proc/modules", encoding="utf-8") as fh:
+            return fh.read().lower()
+    except OSError:
+        return run_command(["lsmod"], timeout=5).lower()
+
+
+def _zfs_pools() -> list[str]:
+    """Return imported ZFS pool names from the SPL kstat tree.
+
+    Each imported pool has a directory under /proc/spl/kstat/zfs; module-wide
+    stats (arcstats, dbufstats, ...) are plain files. Empty when ZFS is not
+    loaded, in which case ``zpool list`` would find nothing either.
+    """
+    try:
+        return sorted(e.name for e in os.scandir("/proc/spl/kstat/zfs") if e.is_dir())
+    except OSError:
+        return []
+
+
 class SystemDetector:  # pylint: disable=too-few-public-methods
     """Detects what kind of Linux system is running and which profiles apply."""
 
     def detect(self) -> DetectionResult:
         result = DetectionResult()
+        with ThreadPoolExecutor(max_workers=len(_PROBES) + 1) as ex:
+            modules_future = ex.submit(_loaded_modules)
+            futures = {
+                name: ex.submit(run_command, argv, timeout, cacheable)
+                for name, argv, timeout, cacheable in _PROBES
+            }
+            probes = {name: future.result() for name, future in futures.items()}
+            modules = modules_future.result()
         result.profiles.append(self._detect_general())
-        result.profiles.append(self._detect_gpu())
-        result.profiles.append(self._detect_nas())
+        result.profiles.append(self._detect_gpu(modules, probes))
+        result.profiles.append(self._detect_nas(modules))
         return result
 
     def _detect_general(self) -> ProfileDetection:
@@ -45,7 +90,7 @@ class SystemDetector:  # pylint: disable=too-few-public-methods
             evidence=["Core system logs — always collected (base Linux profile)"],
         )
 
-    def _detect_gpu(self) -> ProfileDetection:  # pylint: disable=too-many-branches,too-many-statements,too-many-locals
+    def _detect_gpu(self, modules: str, probes: dict[str, str]) -> ProfileDetection:  # pylint: disable=too-many-branches,too-many-statements,too-many-locals
         evidence: list[str] = []
         confidence = 0.0
 
@@ -54,26 +99,25 @@ class SystemDetector:  # pylint: disable=too-few-public-methods
             evidence.append("NVIDIA driver present (/proc/driver/nvidia)")
             confidence = max(confidence, 0.9)
 
-        nvidia_devs = [f for f in os.listdir("/dev") if f.startswith("nvidia")] if os.path.exists("/dev") else []
-        if nvidia_devs:
-            evidence.append(f"NVIDIA device node present (/dev/{nvidia_devs[0]})")
+        # The control node exists whenever the driver is loaded; one stat(2)
+        # instead of enumerating all of /dev.
+        if os.path.exists("/dev/nvidiactl"):
+            evidence.append("NVIDIA device node present (/dev/nvidiactl)")
             confidence = max(confidence, 0.9)
 
-        lsmod_out = run_command(["lsmod"], timeout=5)
-        lsmod_lower = lsmod_out.lower()
-        if "nvidia" in lsmod_lower:
-            evidence.append("NVIDIA kernel module loaded (lsmod)")
+        if "nvidia" in modules:
+            evidence.append("NVIDIA kernel module loaded (/proc/modules)")
             confidence = max(confidence, 0.8)
 
-        smi_out = run_command(["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"], timeout=10)
+        smi_out = probes["nvidia_smi"]
         if smi_out.strip():
             evidence.append(f"nvidia-smi: {smi_out.strip()[:60]}")
             confidence = max(confidence, 0.95)
 
         # ── AMD ───────────────────────────────────────────────────────────
         for mod in ("amdgpu", "amdkfd", "radeon"):
-            if mod in lsmod_lower:
-                evidence.append(f"AMD GPU kernel module loaded ({mod}, lsmod)")
+            if mod in modules:
+                evidence.append(f"AMD GPU kernel module loaded ({mod}, /proc/modules)")
                 confidence = max(confidence, 0.85)
                 break
 
@@ -102,7 +146,7 @@ class SystemDetector:  # pylint: disable=too-few-public-methods
             except OSError:
                 pass
 
-        rocm_out = run_command(["rocm-smi", "--showproductname"], timeout=10)
+        rocm_out = probes["rocm_name"]
         if rocm_out.strip() and "not supported" not in rocm_out.lower():
             for line in rocm_out.splitlines():
                 line = line.strip()
@@ -112,7 +156,7 @@ class SystemDetector:  # pylint: disable=too-few-public-methods
                     break
 
         # ── Workload hints ────────────────────────────────────────────────
-        rocm_pids = run_command(["rocm-smi", "--showpids"], timeout=10)
+        rocm_pids = probes["rocm_pids"]
         for line in rocm_pids.splitlines():
             parts = line.strip().split()
             if len(parts) >= 2 and parts[0].isdigit():
@@ -121,14 +165,12 @@ class SystemDetector:  # pylint: disable=too-few-public-methods
 
         return ProfileDetection(profile="gpu", confidence=confidence, evidence=evidence)
 
-    def _detect_nas(self) -> ProfileDetection:
+    def _detect_nas(self, modules: str) -> ProfileDetection:
         evidence: list[str] = []
         confidence = 0.0
 
-        lsmod_out = run_command(["lsmod"], timeout=5)
-        lsmod_lower = lsmod_out.lower()
         for mod in ("zfs", "btrfs", "md_mod"):
-            if mod in lsmod_lower:
+            if mod in modules:
                 evidence.append(f"Storage stack: {mod} kernel module loaded")
                 confidence = max(confidence, 0.8)
 
@@ -145,13 +187,12 @@ class SystemDetector:  # pylint: disable=too-few-public-methods
             except OSError:
                 pass
 
-        zpool_out = run_command(["zpool", "list", "-H"], timeout=10)
-        if zpool_out.strip():
-            evidence.append(f"ZFS pool(s) detected: {zpool_out.splitlines()[0][:60]}")
+        pools = _zfs_pools()
+        if pools:
+            evidence.append(f"ZFS pool(s) detected: {', '.join(pools)[:60]}")
             confidence = max(confidence, 0.9)
 
         try:
-            import glob as globmod
             block_devs = globmod.glob("/dev/sd?") + globmod.glob("/dev/nvme?n?")
             if len(block_devs) > 2:
                 evidence.append(
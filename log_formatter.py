@@ -1,12 +1,20 @@
 """Formats LogEntry objects into LogLM-native JSON and human-readable text."""
 
 import json
+import mmap
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from collectors.base import LogEntry
 
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
 INSTRUCTION_MAP: dict[str, str] = {
     "error": "Interpret the error message in the given log.",
     "err": "Interpret the error message in the given log.",
@@ -19,53 +27,148 @@ INSTRUCTION_MAP: dict[str, str] = {
 
 _DEFAULT_INSTRUCTION = "Parse and summarize the information in this log entry."
 
+# Buffered text-bundle output is written out in chunks of about this many chars
+_TEXT_FLUSH_CHARS = 1 << 20
+
 
-def entry_to_loglm(entry: LogEntry, template=None) -> dict[str, str]:
-    """Convert a single LogEntry to a LogLM JSON dict.
+def entry_to_loglm(entry: LogEntry) -> dict[str, str]:
+    """Convert a single LogEntry to a LogLM JSON dict using the level defaults.
 
-    If a Template is provided, its instruction rules are tried first.
+    Collectors emit lowercase level names, so the level is used as-is.
+    Template rules are applied by format_entries.
     """
-    instruction = ""
-    if template is not None:
-        instruction = template.resolve_instruction(entry.source, entry.raw, entry.level)
-    if not instruction:
-        instruction = INSTRUCTION_MAP.get(entry.level.lower(), _DEFAULT_INSTRUCTION)
     return {
-        "Instruction": instruction,
+        "Instruction": INSTRUCTION_MAP.get(entry.level, _DEFAULT_INSTRUCTION),
         "Input": entry.raw,
         "Response": "",
     }
 
 
+def _instruction_plan(template, source: str, level: str) -> str | tuple:
+    """Resolve what can be resolved for a (source, level) pair without the body.
+
+    Returns the final instruction when no body-dependent rule can decide it;
+    otherwise the tuple of rules whose source/level conditions match, up to
+    the first that does not need the body (later rules can never be reached).
+    """
+    candidates = []
+    for rule in template.instruction_rules:
+        if rule.matches_context(source, level):
+            candidates.append(rule)
+            if not rule.needs_body:
+                break
+    if not candidates or not candidates[0].needs_body:
+        instruction = candidates[0].instruction if candidates else ""
+        return instruction or INSTRUCTION_MAP.get(level, _DEFAULT_INSTRUCTION)
+    return tuple(candidates)
+
+
+def _resolve_instructions(entries: list[LogEntry], template) -> list[str]:
+    """Return the instruction for each entry, memoizing rule scans per (source, level)."""
+    plans: dict[tuple[str, str], str | tuple] = {}
+    instructions = []
+    append = instructions.append
+    for entry in entries:
+        key = (entry.source, entry.level)
+        plan = plans.get(key)
+        if plan is None:
+            plan = plans[key] = _instruction_plan(template, *key)
+        if isinstance(plan, str):
+            append(plan)
+            continue
+        instruction = ""
+        for rule in plan:
+            if rule.matches_raw(entry.raw):
+                instruction = rule.instruction
+                break
+        append(instruction or INSTRUCTION_MAP.get(entry.level, _DEFAULT_INSTRUCTION))
+    return instructions
+
+
 def format_entries(entries: list[LogEntry], template: Optional[object] = None) -> list[dict[str, str]]:
     """Convert a list of LogEntry objects to LogLM format.
 
-    Pass a Template instance to apply custom instruction rules.
+    Pass a Template instance to apply custom instruction rules. Rule
+    resolution is memoized per (source, level), which repeat heavily across
+    entries; only rules with a pattern are re-checked against each entry's text.
     """
-    return [entry_to_loglm(e, template) for e in entries]
+    if template is None:
+        return [entry_to_loglm(e) for e in entries]
+    instructions = _resolve_instructions(entries, template)
+    return [
+        {"Instruction": instruction, "Input": entry.raw, "Response": ""}
+        for instruction, entry in zip(instructions, entries)
+    ]
+
+
+def load_json(input_path: Path) -> list[dict]:
+    """Read a LogLM JSON file written by save_json().
+
+    Uses orjson when installed, parsing straight from a read-only mapping of
+    the file so large collections are not first copied into a bytes object.
+    """
+    if _ORJSON_AVAILABLE:
+        with open(input_path, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:  # mmap() rejects empty files
+                return orjson.loads(b"")
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+    with open(input_path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def dumps_json(obj) -> bytes:
+    """Serialize *obj* to compact UTF-8 JSON bytes, with orjson when installed."""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
 
 
 def save_json(loglm_entries: list[dict[str, str]], output_path: Path) -> None:
-    """Write LogLM entries as a JSON file."""
+    """Write LogLM entries as a JSON file.
+
+    Uses orjson when installed: the whole document is serialized in C and
+    written with one call instead of one write per JSON fragment.
+    """
+    if _ORJSON_AVAILABLE:
+        with open(output_path, "wb") as fh:
+            fh.write(orjson.dumps(loglm_entries, option=orjson.OPT_INDENT_2))
+        return
     with open(output_path, "w", encoding="utf-8") as fh:
         json.dump(loglm_entries, fh, indent=2, ensure_ascii=False)
 
 
 def save_text_bundle(entries: list[LogEntry], output_path: Path) -> None:
-    """Write a human-readable text summary of all log entries."""
-    with open(output_path, "w", encoding="utf-8") as fh:
-        fh.write("LogLM Collector \u2014 Log Bundle\n")
-        fh.write(f"Generated: {datetime.now().isoformat()}\n")
-        fh.write(f"Total entries: {len(entries)}\n")
-        fh.write("=" * 80 + "\n\n")
+    """Write a human-readable text summary of all log entries.
 
+    Lines are accumulated and written once per _TEXT_FLUSH_CHARS of output
+    rather than with one write() call per fragment.
+    """
+    parts = [
+        "LogLM Collector \u2014 Log Bundle\n",
+        f"Generated: {datetime.now().isoformat()}\n",
+        f"Total entries: {len(entries)}\n",
+        "=" * 80 + "\n\n",
+    ]
+    append = parts.append
+    size = 0
+    with open(output_path, "w", encoding="utf-8") as fh:
         current_source = None
         for entry in entries:
             if entry.source != current_source:
                 current_source = entry.source
-                fh.write(f"\n--- Source: {entry.source} ---\n")
+                append(f"\n--- Source: {entry.source} ---\n")
             ts = entry.timestamp.isoformat() if entry.timestamp else "N/A"
-            fh.write(f"[{ts}] [{entry.level.upper()}] {entry.message}\n")
+            count = entry.extra.get("count", 1) if entry.extra else 1
+            repeat = f" (x{count})" if count > 1 else ""
+            line = f"[{ts}] [{entry.level.upper()}] {entry.message}{repeat}\n"
+            append(line)
+            size += len(line)
+            if size >= _TEXT_FLUSH_CHARS:
+                fh.write("".join(parts))
+                parts.clear()
+                size = 0
+        fh.write("".join(parts))
 
 
 def generate_output_paths(base_dir: Path | None = None) -> tuple[Path, Path]:
@@ -1,61 +1,87 @@
 """HTTP client for the LogLM API with file-output fallback."""
 
-import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     _REQUESTS_AVAILABLE = True
 except ImportError:
     _REQUESTS_AVAILABLE = False
 
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
 from rich.console import Console
 
+from log_formatter import save_json
+
 console = Console(stderr=True)
 
 _DEFAULT_BASE_URL = "http://localhost:8000"
 
+# Concurrent in-flight requests when sending entries; the pool is sized to match
+_SEND_WORKERS = 8
+
+# One keep-alive session for every call in the process, so the API check and
+# later sends reuse the same connections.
+if _REQUESTS_AVAILABLE:
+    _SESSION = requests.Session()
+    _ADAPTER = HTTPAdapter(pool_connections=_SEND_WORKERS, pool_maxsize=_SEND_WORKERS)
+    _SESSION.mount("http://", _ADAPTER)
+    _SESSION.mount("https://", _ADAPTER)
+
 
 def check_api_running(base_url: str = _DEFAULT_BASE_URL) -> bool:
     """Return True if the LogLM API is reachable at base_url."""
     if not _REQUESTS_AVAILABLE:
         return False
     try:
-        response = requests.get(base_url + "/", timeout=2)
+        response = _SESSION.get(base_url + "/", timeout=2)
         return response.status_code < 500
     except Exception:  # pylint: disable=broad-except
         return False
 
 
 def send_entries(entries: list[dict], base_url: str = _DEFAULT_BASE_URL) -> list[dict]:
-    """POST each entry to the LogLM API, return list of response dicts."""
+    """POST each entry to the LogLM API, return list of response dicts.
+
+    Requests share one keep-alive session and up to _SEND_WORKERS are in
+    flight at once; results come back in the same order as *entries*.
+    """
     if not _REQUESTS_AVAILABLE:
         console.print("[red]requests library not available; cannot send to API.[/red]")
         return []
+    if not entries:
+        return []
+
+    url = base_url + "/analyze"
+    headers = {"Content-Type": "application/json"}
 
-    results = []
-    for entry in entries:
+    def _post_one(entry: dict) -> dict:
         try:
-            response = requests.post(
-                base_url + "/analyze",
-                json=entry,
-                timeout=30,
-            )
+            if _ORJSON_AVAILABLE:
+                response = _SESSION.post(url, data=orjson.dumps(entry), headers=headers, timeout=30)
+            else:
+                response = _SESSION.post(url, json=entry, timeout=30)
             if response.status_code == 200:
                 data = response.json()
-                results.append({**entry, "Response": data.get("response", data.get("Response", ""))})
-            else:
-                console.log(f"[yellow]API returned {response.status_code} for entry[/yellow]")
-                results.append({**entry, "Response": f"API error: {response.status_code}"})
+                return {**entry, "Response": data.get("response", data.get("Response", ""))}
+            console.log(f"[yellow]API returned {response.status_code} for entry[/yellow]")
+            return {**entry, "Response": f"API error: {response.status_code}"}
         except Exception as e:  # pylint: disable=broad-except
             console.log(f"[red]Failed to send entry to API: {e}[/red]")
-            results.append({**entry, "Response": f"Send error: {e}"})
+            return {**entry, "Response": f"Send error: {e}"}
 
-    return results
+    with ThreadPoolExecutor(max_workers=min(_SEND_WORKERS, len(entries))) as ex:
+        return list(ex.map(_post_one, entries))
 
 
 def save_to_file(entries: list[dict], output_path: Path) -> None:
     """Write LogLM entries as a JSON file."""
-    with open(output_path, "w", encoding="utf-8") as fh:
-        json.dump(entries, fh, indent=2, ensure_ascii=False)
+    save_json(entries, output_path)
     console.print(f"[green]Saved {len(entries)} entries to {output_path}[/green]")
@@ -8,7 +8,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from collectors.base import LogEntry
 from collectors.custom import CustomSourceCollector
-from collectors.scout import LogScout, ScoutResult
+from collectors.scout import LogScout
 from detector import SystemDetector
 from log_formatter import format_entries, generate_output_paths, save_json, save_text_bundle
 from loglm_client import check_api_running, save_to_file, send_entries
@@ -247,7 +247,7 @@ def _run_scout() -> None:
         scout.stop()
         console.print()
         console.print("[yellow]Scout stopped early by user.[/yellow]")
-        result = ScoutResult(duration_seconds=duration, hits=list(scout._hits))
+        result = scout.result()
 
     menu.show_scout_results(result)
 
@@ -1,11 +1,19 @@
 """Template data models and JSON persistence for loglm_collector."""
 
+import hashlib
 import json
+import os
 import re
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
 _CONFIG_DIR = Path.home() / ".config" / "loglm_collector"
 _TEMPLATES_FILE = _CONFIG_DIR / "templates.json"
 
@@ -27,7 +35,7 @@ INSTRUCTION_SUGGESTIONS: list[str] = [
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class InstructionRule:
     """Maps a log-matching condition to a custom instruction string."""
 
@@ -35,18 +43,52 @@ class InstructionRule:
     match_source: str = ""       # substring match on LogEntry.source
     match_pattern: str = ""      # regex match on LogEntry.raw
     match_levels: list[str] = field(default_factory=list)  # e.g. ["err", "crit"]
+    # match_pattern compiled on first use; False if it is not a valid regex
+    _compiled: Optional[re.Pattern] | bool = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Lowercased match_source / match_levels, precomputed for matches_context()
+    _source_lower: str = field(default="", init=False, repr=False, compare=False)
+    _levels_lower: frozenset[str] = field(
+        default=frozenset(), init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._source_lower = self.match_source.lower()
+        self._levels_lower = frozenset(l.lower() for l in self.match_levels)
+
+    @property
+    def needs_body(self) -> bool:
+        """True if matching this rule depends on the entry's raw text."""
+        return bool(self.match_pattern)
 
     def matches(self, source: str, raw: str, level: str) -> bool:
         """Return True if this rule matches the given log entry fields."""
-        if self.match_source and self.match_source.lower() not in source.lower():
+        return self.matches_context(source, level) and self.matches_raw(raw)
+
+    def matches_context(self, source: str, level: str) -> bool:
+        """Return True if the source and level conditions match (ignores the pattern).
+
+        The level set is checked before the source substring; both are
+        cheaper than the regex in matches_raw(), which callers run last.
+        """
+        if self._levels_lower and level.lower() not in self._levels_lower:
             return False
-        if self.match_levels and level.lower() not in [l.lower() for l in self.match_levels]:
+        if self._source_lower and self._source_lower not in source.lower():
             return False
+        return True
+
+    def matches_raw(self, raw: str) -> bool:
+        """Return True if the pattern condition matches *raw* (or there is none)."""
         if self.match_pattern:
-            try:
-                if not re.search(self.match_pattern, raw, re.IGNORECASE):
-                    return False
-            except re.error:
+            pattern = self._compiled
+            if pattern is None:
+                try:
+                    pattern = re.compile(self.match_pattern, re.IGNORECASE)
+                except re.error:
+                    pattern = False
+                self._compiled = pattern
+            if pattern is False or not pattern.search(raw):
                 return False
         return True
 
@@ -63,7 +105,7 @@ class InstructionRule:
         return f"[{cond}] → {self.instruction[:60]}"
 
 
-@dataclass
+@dataclass(slots=True)
 class CustomSource:
     """A user-defined log source to collect from."""
 
@@ -71,6 +113,25 @@ class CustomSource:
     path_glob: str
     filter_pattern: str = ""   # optional regex to filter lines
     default_level: str = "info"
+    # filter_pattern compiled once; None when unset or invalid
+    _filter_re: Optional[re.Pattern] = field(default=None, init=False, repr=False, compare=False)
+    _filter_error: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.filter_pattern:
+            try:
+                self._filter_re = re.compile(self.filter_pattern, re.IGNORECASE)
+            except re.error as e:
+                self._filter_error = str(e)
+
+    @property
+    def filter_error(self) -> str:
+        """Why filter_pattern failed to compile, or "" if it is unset or valid."""
+        return self._filter_error
+
+    def match_line(self, line: str) -> bool:
+        """Return True if *line* passes the filter (always, without one)."""
+        return self._filter_re is None or self._filter_re.search(line) is not None
 
     def describe(self) -> str:
         parts = [f"glob: {self.path_glob}"]
@@ -80,7 +141,7 @@ class CustomSource:
         return f"{self.name} ({', '.join(parts)})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Template:
     """A named collection of instruction rules and optional custom sources."""
 
@@ -89,12 +150,17 @@ class Template:
     instruction_rules: list[InstructionRule] = field(default_factory=list)
     custom_sources: list[CustomSource] = field(default_factory=list)
 
-    def resolve_instruction(self, source: str, raw: str, level: str) -> str:
-        """Return the first matching rule's instruction, or None if no match."""
+    def resolve_instruction(self, source: str, raw: str, level: str) -> Optional[str]:
+        """Return the first matching rule's instruction, or None if no match.
+
+        Single-entry reference for the rule semantics. log_formatter does not
+        call it; format_entries resolves rules per (source, level) through
+        _instruction_plan, which must agree with this loop.
+        """
         for rule in self.instruction_rules:
             if rule.matches(source, raw, level):
                 return rule.instruction
-        return ""
+        return None
 
 
 BUILTIN_TEMPLATES: list[Template] = [
@@ -432,49 +498,80 @@ class TemplateStore:
 
     def __init__(self, path: Path = _TEMPLATES_FILE) -> None:
         self._path = path
-        self._templates: list[Template] = []
-        self._load()
+        # By name, in insertion order; None until first accessed, so runs that
+        # never touch templates do not read the file at all.
+        self._templates: Optional[dict[str, Template]] = None
+        self._last_digest: Optional[bytes] = None  # blake2b of the file as last read/written
 
     def all(self) -> list[Template]:
-        return list(self._templates)
+        return list(self._ensure_loaded().values())
 
     def get(self, name: str) -> Optional[Template]:
-        for t in self._templates:
-            if t.name == name:
-                return t
-        return None
+        return self._ensure_loaded().get(name)
 
     def save_template(self, template: Template) -> None:
         """Add or replace a template by name, then persist."""
-        self._templates = [t for t in self._templates if t.name != template.name]
-        self._templates.append(template)
+        self._ensure_loaded()[template.name] = template
         self._persist()
 
     def delete(self, name: str) -> bool:
-        before = len(self._templates)
-        self._templates = [t for t in self._templates if t.name != name]
-        if len(self._templates) < before:
-            self._persist()
-            return True
-        return False
+        if self._ensure_loaded().pop(name, None) is None:
+            return False
+        self._persist()
+        return True
 
     # ── persistence ───────────────────────────────────────────────────────
 
+    def _ensure_loaded(self) -> dict[str, Template]:
+        if self._templates is None:
+            self._load()
+        return self._templates
+
     def _load(self) -> None:
         if not self._path.exists():
-            self._templates = []
+            self._templates = {}
             return
         try:
-            with open(self._path, encoding="utf-8") as fh:
-                data = json.load(fh)
-            self._templates = [self._from_dict(t) for t in data]
+            raw = self._path.read_bytes()
+            data = orjson.loads(raw) if _ORJSON_AVAILABLE else json.loads(raw)
+            self._last_digest = hashlib.blake2b(raw).digest()
+            self._templates = {t["name"]: self._from_dict(t) for t in data}
         except Exception:  # pylint: disable=broad-except
-            self._templates = []
+            self._templates = {}
 
     def _persist(self) -> None:
+        """Write the templates file, unless it would come out byte-identical.
+
+        The new contents go to a temporary file that is fsynced and renamed
+        over the old one, so a crash mid-write cannot leave it truncated.
+        """
+        templates = list(self._templates.values())
+        if _ORJSON_AVAILABLE:
+            # orjson walks the dataclasses itself and leaves out "_" fields,
+            # so no intermediate dicts are built.
+            payload = orjson.dumps(templates, option=orjson.OPT_INDENT_2)
+        else:
+            data = [self._to_dict(t) for t in templates]
+            payload = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        digest = hashlib.blake2b(payload).digest()
+        if digest == self._last_digest:
+            return
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self._path, "w", encoding="utf-8") as fh:
-            json.dump([asdict(t) for t in self._templates], fh, indent=2, ensure_ascii=False)
+        tmp = self._path.with_suffix(".json.tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self._path)
+        self._last_digest = digest
+
+    @staticmethod
+    def _to_dict(template: Template) -> dict:
+        # asdict() minus private fields, which hold derived state only
+        return asdict(
+            template,
+            dict_factory=lambda items: {k: v for k, v in items if not k.startswith("_")},
+        )
 
     @staticmethod
     def _from_dict(data: dict) -> Template:
@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass, field
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.prompt import Confirm, Prompt
 from rich.table import Table
@@ -87,7 +87,7 @@ def choose_issue_type(detection: DetectionResult) -> str:
     return choices[int(choice) - 1][0]
 
 
-@dataclass
+@dataclass(slots=True)
 class ProfileConfig:
     """User-selected configuration for a single collector profile."""
 
@@ -97,7 +97,7 @@ class ProfileConfig:
     sources: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class CollectionConfig:
     """Full user-selected collection configuration."""
 
@@ -204,16 +204,11 @@ class InteractiveMenu:
         return configs
 
     def _show_welcome(self, detection: DetectionResult) -> None:
-        console.print()
-        console.print(
-            Panel.fit(
-                "[bold cyan]LogLM Collector[/bold cyan]\n"
-                "[dim]Auto-detects logs and formats them for LogLM analysis[/dim]",
-                border_style="cyan",
-            )
+        banner = Panel.fit(
+            "[bold cyan]LogLM Collector[/bold cyan]\n"
+            "[dim]Auto-detects logs and formats them for LogLM analysis[/dim]",
+            border_style="cyan",
         )
-        console.print()
-
         table = Table(
             title="Detected system types",
             caption="[dim]Match = how sure we are this applies to your system; details explain why.[/dim]",
@@ -229,8 +224,7 @@ class InteractiveMenu:
             evidence = "; ".join(p.evidence[:2]) if p.evidence else "N/A"
             table.add_row(p.profile.upper(), f"[{color}]{conf_str}[/{color}]", evidence)
 
-        console.print(table)
-        console.print()
+        console.print(Group("", banner, "", table, ""))
 
     def _choose_process_target(self) -> ProcessTarget | None:
         """Let user pick one of top 5 processes, custom input, or (if available) all/select containers."""
@@ -389,15 +383,14 @@ class InteractiveMenu:
                 continue
             collector = collector_cls()
 
-            console.print(f"  [bold cyan]{collector.get_name()}[/bold cyan] — {collector.get_description()}")
-            console.print("  Sources:")
-            for src in collector.get_log_sources():
-                console.print(f"    • {src}")
-            console.print()
-
-            console.print("  Time range:")
-            for key, label in HOURS_LABELS.items():
-                console.print(f"    {key}. {label}")
+            lines = [
+                f"  [bold cyan]{collector.get_name()}[/bold cyan] — {collector.get_description()}",
+                "  Sources:",
+            ]
+            lines += [f"    • {src}" for src in collector.get_log_sources()]
+            lines += ["", "  Time range:"]
+            lines += [f"    {key}. {label}" for key, label in HOURS_LABELS.items()]
+            console.print("\n".join(lines))
 
             choice = Prompt.ask("  Select time range", choices=list(HOURS_LABELS.keys()), default="3")
             hours = HOURS_OPTIONS[choice]
@@ -477,6 +470,11 @@ class InteractiveMenu:
 
         table.add_row("[bold]TOTAL[/bold]", f"[bold]{result.total}[/bold]", "")
         console.print(table)
+        if result.dropped:
+            console.print(
+                f"  [yellow]{result.dropped} older hit{'s' if result.dropped != 1 else ''} "
+                f"dropped once the hit limit was reached.[/yellow]"
+            )
         console.print()
 
         # Show up to 15 sample lines
@@ -7,15 +7,18 @@ Three main modes:
 """
 
 import copy
-import json
+import os
 from pathlib import Path
 from typing import Optional
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
+from rich.prompt import Confirm, IntPrompt, Prompt
+from rich.style import Style
 from rich.table import Table
+from rich.text import Text
 
+from log_formatter import dumps_json, load_json
 from templates.store import (
     BUILTIN_NAMES,
     BUILTIN_TEMPLATES,
@@ -30,29 +33,65 @@ console = Console()
 
 _LEVELS = ["emerg", "alert", "crit", "err", "warning", "notice", "info", "debug"]
 
+# Prompt choices for the editor and manager loops
+_RULE_ACTIONS = ["a", "d", "c"]
+_SOURCE_ACTIONS = ["a", "d", "c"]
+_SOURCE_LEVELS = ["err", "warning", "info", "crit"]
+_MANAGER_ACTIONS = ["n", "c", "e", "d", "b"]
+
+# Labeler entry card: border style parsed once, and how much Input to show
+_ENTRY_BORDER = Style(color="blue")
+_ENTRY_INPUT_CHARS = 500
+
 
 # ── helpers ───────────────────────────────────────────────────────────────────
 
 
 def _header(title: str) -> None:
-    console.print()
-    console.print(Panel.fit(f"[bold cyan]{title}[/bold cyan]", border_style="cyan"))
-    console.print()
+    console.print(Group("", Panel.fit(f"[bold cyan]{title}[/bold cyan]", border_style="cyan"), ""))
 
 
-def _pick_from_list(items: list[str], prompt: str, allow_skip: bool = False) -> Optional[str]:
-    """Display numbered list and return chosen item, or None if skipped."""
-    for i, item in enumerate(items, 1):
-        console.print(f"  [dim]{i:2}.[/dim] {item}")
-    console.print()
-    choices = [str(i) for i in range(1, len(items) + 1)]
+def _render_numbered(items: list[str]) -> Text:
+    """Render *items* as a numbered list followed by a blank line."""
+    return Text.from_markup(
+        "".join(f"  [dim]{i:2}.[/dim] {item}\n" for i, item in enumerate(items, 1))
+    )
+
+
+# The suggestion list never changes; render it once instead of per rule built
+_SUGGESTIONS_RENDERED = _render_numbered(INSTRUCTION_SUGGESTIONS)
+
+
+def _pick_from_list(
+    items: list[str], prompt: str, allow_skip: bool = False, rendered: Optional[Text] = None
+) -> Optional[str]:
+    """Display numbered list and return chosen item, or None if skipped.
+
+    Pass *rendered* to print a list already built by _render_numbered(items).
+    """
+    console.print(rendered if rendered is not None else _render_numbered(items))
     if allow_skip:
-        choices.append("0")
         console.print("   [dim]0.[/dim] Skip / leave blank")
-    choice = Prompt.ask(prompt, choices=choices, default="0" if allow_skip else "1")
-    if choice == "0":
+    choice = _ask_number(prompt, len(items), default=0 if allow_skip else 1, allow_zero=allow_skip)
+    if choice == 0:
         return None
-    return items[int(choice) - 1]
+    return items[choice - 1]
+
+
+def _ask_number(
+    prompt: str, count: int, default: Optional[int] = None, allow_zero: bool = False
+) -> int:
+    """Prompt for an integer in 1..*count* (or 0 if *allow_zero*), re-asking until valid."""
+    low = 0 if allow_zero else 1
+    prompt = f"{prompt} [dim]({low}-{count})[/dim]"
+    while True:
+        if default is None:
+            choice = IntPrompt.ask(prompt)
+        else:
+            choice = IntPrompt.ask(prompt, default=default)
+        if low <= choice <= count:
+            return choice
+        console.print(f"[red]Please enter a number from {low} to {count}[/red]")
 
 
 # ── instruction rule builder ──────────────────────────────────────────────────
@@ -62,7 +101,12 @@ def _build_instruction_rule() -> Optional[InstructionRule]:
     """Interactively build one InstructionRule; returns None if aborted."""
     console.print("[bold]Instruction text[/bold] — choose a suggestion or type your own:")
     console.print()
-    instruction = _pick_from_list(INSTRUCTION_SUGGESTIONS, "Select suggestion (0 = type own)", allow_skip=True)
+    instruction = _pick_from_list(
+        INSTRUCTION_SUGGESTIONS,
+        "Select suggestion (0 = type own)",
+        allow_skip=True,
+        rendered=_SUGGESTIONS_RENDERED,
+    )
     if instruction is None:
         instruction = Prompt.ask("  Custom instruction text").strip()
     if not instruction:
@@ -120,7 +164,7 @@ def _build_custom_source() -> Optional[CustomSource]:
 
     level = Prompt.ask(
         "  Default log level  [dim](err/warning/info)[/dim]",
-        choices=["err", "warning", "info", "crit"],
+        choices=_SOURCE_LEVELS,
         default="info",
     )
 
@@ -150,7 +194,7 @@ def _edit_template(template: Template) -> Template:
         console.print()
         action = Prompt.ask(
             "  [a]dd rule  [d]elete rule  [c]ontinue",
-            choices=["a", "d", "c"],
+            choices=_RULE_ACTIONS,
             default="c",
         )
         if action == "c":
@@ -162,11 +206,8 @@ def _edit_template(template: Template) -> Template:
                 template.instruction_rules.append(rule)
                 console.print("[green]Rule added.[/green]")
         elif action == "d" and template.instruction_rules:
-            idx_str = Prompt.ask(
-                "  Delete rule number",
-                choices=[str(i) for i in range(1, len(template.instruction_rules) + 1)],
-            )
-            template.instruction_rules.pop(int(idx_str) - 1)
+            idx = _ask_number("  Delete rule number", len(template.instruction_rules))
+            template.instruction_rules.pop(idx - 1)
             console.print("[yellow]Rule removed.[/yellow]")
         console.print()
 
@@ -179,7 +220,7 @@ def _edit_template(template: Template) -> Template:
         console.print()
         action = Prompt.ask(
             "  [a]dd source  [d]elete source  [c]ontinue",
-            choices=["a", "d", "c"],
+            choices=_SOURCE_ACTIONS,
             default="c",
         )
         if action == "c":
@@ -191,11 +232,8 @@ def _edit_template(template: Template) -> Template:
                 template.custom_sources.append(src)
                 console.print("[green]Source added.[/green]")
         elif action == "d" and template.custom_sources:
-            idx_str = Prompt.ask(
-                "  Delete source number",
-                choices=[str(i) for i in range(1, len(template.custom_sources) + 1)],
-            )
-            template.custom_sources.pop(int(idx_str) - 1)
+            idx = _ask_number("  Delete source number", len(template.custom_sources))
+            template.custom_sources.pop(idx - 1)
             console.print("[yellow]Source removed.[/yellow]")
         console.print()
 
@@ -213,30 +251,30 @@ class TemplateManager:  # pylint: disable=too-few-public-methods
 
     def run(self) -> None:
         """Enter the template management loop."""
+        # Built-in presets (read-only) never change, so their table is built once
+        builtin_table = Table(border_style="cyan", show_header=True, show_edge=False)
+        builtin_table.add_column("Name", style="cyan")
+        builtin_table.add_column("Description")
+        builtin_table.add_column("Rules", justify="right")
+        for t in BUILTIN_TEMPLATES:
+            builtin_table.add_row(
+                t.name, t.description[:55], str(len(t.instruction_rules))
+            )
+
         while True:
             _header("LogLM Template Manager")
 
-            # Built-in presets (read-only)
-            console.print(
+            screen = [
                 "  [bold]Built-in presets[/bold] "
-                "[dim](read-only — use [c]lone to customise)[/dim]"
-            )
-            console.print()
-            builtin_table = Table(border_style="cyan", show_header=True, show_edge=False)
-            builtin_table.add_column("Name", style="cyan")
-            builtin_table.add_column("Description")
-            builtin_table.add_column("Rules", justify="right")
-            for t in BUILTIN_TEMPLATES:
-                builtin_table.add_row(
-                    t.name, t.description[:55], str(len(t.instruction_rules))
-                )
-            console.print(builtin_table)
-            console.print()
+                "[dim](read-only — use [c]lone to customise)[/dim]",
+                "",
+                builtin_table,
+                "",
+            ]
 
             # User templates
             templates = self._store.all()
-            console.print("  [bold]Your templates[/bold]")
-            console.print()
+            screen += ["  [bold]Your templates[/bold]", ""]
             if templates:
                 table = Table(border_style="blue", show_header=True, show_edge=False)
                 table.add_column("#", justify="right", style="dim")
@@ -250,14 +288,15 @@ class TemplateManager:  # pylint: disable=too-few-public-methods
                         str(len(t.instruction_rules)),
                         str(len(t.custom_sources)),
                     )
-                console.print(table)
+                screen.append(table)
             else:
-                console.print("  [dim]No templates saved yet.[/dim]")
+                screen.append("  [dim]No templates saved yet.[/dim]")
+            screen.append("")
+            console.print(Group(*screen))
 
-            console.print()
             action = Prompt.ask(
                 "  [n]ew  [c]lone preset  [e]dit  [d]elete  [b]ack",
-                choices=["n", "c", "e", "d", "b"],
+                choices=_MANAGER_ACTIONS,
                 default="b",
             )
 
@@ -367,9 +406,7 @@ def select_template(store: TemplateStore) -> Optional[Template]:
     console.print(f"  {manage_idx:2}. [Manage templates]")
     console.print()
 
-    choices = [str(i) for i in range(1, manage_idx + 1)]
-    choice = Prompt.ask("  Select", choices=choices, default=str(no_tmpl_idx))
-    idx = int(choice) - 1
+    idx = _ask_number("  Select", manage_idx, default=no_tmpl_idx) - 1
 
     if idx == no_tmpl_idx - 1:
         return None
@@ -408,72 +445,104 @@ class ResponseLabeler:  # pylint: disable=too-few-public-methods
             return
 
         try:
-            with open(input_path, encoding="utf-8") as fh:
-                entries: list[dict] = json.load(fh)
+            entries: list[dict] = load_json(input_path)
         except Exception as e:  # pylint: disable=broad-except
             console.print(f"[red]Failed to load file: {e}[/red]")
             return
 
         output_path = input_path.parent / (input_path.stem + "_labeled.json")
-        console.print(f"  Labeled output will be saved to: [bold]{output_path}[/bold]")
-        console.print()
-        console.print("  Commands during labeling:")
-        console.print("    [bold]Enter[/bold]          skip this entry (keep blank Response)")
-        console.print("    [bold]s[/bold]              skip remaining entries and save")
-        console.print("    [bold]q[/bold]              quit without saving")
-        console.print()
+        console.print(
+            f"  Labeled output will be saved to: [bold]{output_path}[/bold]\n"
+            "\n"
+            "  Commands during labeling:\n"
+            "    [bold]Enter[/bold]          skip this entry (keep blank Response)\n"
+            "    [bold]s[/bold]              skip remaining entries and save\n"
+            "    [bold]q[/bold]              quit without saving\n"
+        )
 
         if not Confirm.ask("  Begin labeling?", default=True):
             return
 
-        labeled = list(entries)  # copy
+        # Entries are written out as they are labeled, to a .partial file
+        # that is renamed into place at the end: a crash keeps the work done
+        # so far, and nothing has to be re-serialized in one go at the end.
+        partial_path = output_path.with_suffix(".json.partial")
+        labeled_count = 0
         skip_rest = False
+        quit_early = False
+        with open(partial_path, "wb") as fh:
+            fh.write(b"[")
+            for i, entry in enumerate(entries):
+                if not skip_rest:
+                    action = self._label_entry(i, len(entries), entry)
+                    if action == "q":
+                        quit_early = True
+                        break
+                    skip_rest = action == "s"
+                if entry.get("Response"):
+                    labeled_count += 1
+                fh.write(b"\n" if i == 0 else b",\n")
+                fh.write(dumps_json(entry))
+                fh.flush()
+            fh.write(b"\n]\n")
+
+        if quit_early:
+            partial_path.unlink()
+            console.print("[yellow]Quit — nothing saved.[/yellow]")
+            return
 
-        for i, entry in enumerate(labeled):
-            if skip_rest:
-                break
-
-            console.print()
-            console.print(f"[dim]─── Entry {i + 1} / {len(labeled)} ───────────────────────────────[/dim]")
-            console.print()
-            console.print(
-                Panel(
-                    f"[bold]Instruction:[/bold] {entry.get('Instruction', '')}\n\n"
-                    f"[bold]Input:[/bold] {entry.get('Input', '')[:500]}",
-                    border_style="blue",
-                    expand=False,
-                )
-            )
-            console.print()
-
-            existing = entry.get("Response", "")
-            if existing:
-                console.print(f"  [dim]Existing response:[/dim] {existing[:80]}")
-
-            response = Prompt.ask(
-                "  Response [dim](Enter=skip, s=stop, q=quit)[/dim]",
-                default="",
-            ).strip()
-
-            if response == "q":
-                console.print("[yellow]Quit — nothing saved.[/yellow]")
-                return
-            if response == "s":
-                skip_rest = True
-                continue
-            if response:
-                labeled[i] = {**entry, "Response": response}
-
-        labeled_count = sum(1 for e in labeled if e.get("Response"))
         console.print()
-        console.print(f"  [green]{labeled_count}[/green] of {len(labeled)} entries annotated.")
+        console.print(f"  [green]{labeled_count}[/green] of {len(entries)} entries annotated.")
 
         if labeled_count == 0:
             if not Confirm.ask("  No responses written — save anyway?", default=False):
+                partial_path.unlink()
                 return
 
-        with open(output_path, "w", encoding="utf-8") as fh:
-            json.dump(labeled, fh, indent=2, ensure_ascii=False)
+        os.replace(partial_path, output_path)
 
         console.print(f"[green]Saved to {output_path}[/green]")
         console.print()
+
+    @staticmethod
+    def _label_entry(i: int, total: int, entry: dict) -> str:
+        """Show one entry and prompt for its Response.
+
+        Stores a typed response on *entry*; returns "s" or "q" for those
+        commands, otherwise "".
+        """
+        # One render per entry: separator, entry panel and any existing response.
+        # Entry text goes in through Text.assemble, so log lines containing
+        # "[...]" are shown verbatim instead of being parsed as markup.
+        inp = entry.get("Input", "")
+        if len(inp) > _ENTRY_INPUT_CHARS:
+            inp = inp[:_ENTRY_INPUT_CHARS]
+        card = [
+            "",
+            f"[dim]─── Entry {i + 1} / {total} ───────────────────────────────[/dim]",
+            "",
+            Panel(
+                Text.assemble(
+                    ("Instruction:", "bold"), " ", entry.get("Instruction", ""), "\n\n",
+                    ("Input:", "bold"), " ", inp,
+                ),
+                border_style=_ENTRY_BORDER,
+                expand=False,
+            ),
+            "",
+        ]
+        existing = entry.get("Response", "")
+        if existing:
+            card.append(Text.assemble("  ", ("Existing response:", "dim"), " ", existing[:80]))
+        console.print(Group(*card))
+
+        response = Prompt.ask(
+            "  Response [dim](Enter=skip, s=stop, q=quit)[/dim]",
+            default="",
+        ).strip()
+
+        if response in ("q", "s"):
+            return response
+        if response:
+            entry["Response"] = response
+        return ""